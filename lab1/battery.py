@@ -0,0 +1,240 @@
+import math
+
+import numpy as np
+
+from lab1.utils1 import CHUNK_SIZE, SYSTEM_HIGH, SYSTEM_LOW, generate_system_array
+
+MAX_BIRTHDAY_BITS = 24
+
+
+def gamma_q(a, x):
+    # Regularized upper incomplete gamma Q(a, x): series below a + 1, Lentz continued fraction above
+    if x <= 0:
+        return 1.0
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(10000):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def chi_square_p_value(observed, expected):
+    # nan when there is nothing to judge: no samples, or a cell that cannot be hit
+    observed = np.asarray(observed, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    if observed.sum() == 0 or np.any(expected <= 0):
+        return math.nan
+    statistic = float(np.sum((observed - expected) ** 2 / expected))
+    return gamma_q((len(observed) - 1) / 2, statistic / 2)
+
+
+def normal_two_sided_p_value(z):
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def to_uniform(block, low, high):
+    return (np.asarray(block, dtype=np.float64) - low) / (high - low + 1)
+
+
+class FrequencyTest:
+    def __init__(self, bins=256):
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, u):
+        self.counts += np.bincount((u * len(self.counts)).astype(np.int64), minlength=len(self.counts))
+
+    def p_value(self):
+        total = self.counts.sum()
+        return chi_square_p_value(self.counts, np.full(len(self.counts), total / len(self.counts)))
+
+
+class SerialTest:
+    # Non-overlapping d-tuples, each coordinate split into `bins` cells
+    def __init__(self, dimension=2, bins=16):
+        self.dimension = dimension
+        self.bins = bins
+        self.counts = np.zeros(bins ** dimension, dtype=np.int64)
+        self.carry = np.empty(0)
+
+    def update(self, u):
+        u = np.concatenate((self.carry, u))
+        usable = len(u) - len(u) % self.dimension
+        self.carry = u[usable:]
+        cells = (u[:usable] * self.bins).astype(np.int64).reshape(-1, self.dimension)
+        index = cells @ (self.bins ** np.arange(self.dimension - 1, -1, -1))
+        self.counts += np.bincount(index, minlength=len(self.counts))
+
+    def p_value(self):
+        total = self.counts.sum()
+        return chi_square_p_value(self.counts, np.full(len(self.counts), total / len(self.counts)))
+
+
+class RunsTest:
+    # Wald-Wolfowitz runs above/below 1/2
+    def __init__(self):
+        self.above = 0
+        self.total = 0
+        self.runs = 0
+        self.last = None
+
+    def update(self, u):
+        if len(u) == 0:
+            return
+        bits = u >= 0.5
+        self.runs += int(np.count_nonzero(bits[1:] != bits[:-1]))
+        if self.last is None:
+            self.runs += 1
+        elif self.last != bits[0]:
+            self.runs += 1
+        self.last = bits[-1]
+        self.above += int(np.count_nonzero(bits))
+        self.total += len(bits)
+
+    def p_value(self):
+        n1, n = self.above, self.total
+        n2 = n - n1
+        if n == 0:
+            return math.nan
+        if n1 == 0 or n2 == 0:
+            return 0.0
+        mean = 2 * n1 * n2 / n + 1
+        variance = (mean - 1) * (mean - 2) / (n - 1)
+        return normal_two_sided_p_value((self.runs - mean) / math.sqrt(variance)) if variance > 0 else 0.0
+
+
+class GapTest:
+    # Lengths of gaps between visits to [low, high), lumped at max_gap
+    def __init__(self, low=0.0, high=0.25, max_gap=16):
+        self.low = low
+        self.high = high
+        self.max_gap = max_gap
+        self.counts = np.zeros(max_gap + 1, dtype=np.int64)
+        self.offset = 0
+        self.last_hit = None
+
+    def update(self, u):
+        hits = np.flatnonzero((u >= self.low) & (u < self.high)) + self.offset
+        self.offset += len(u)
+        if len(hits) == 0:
+            return
+        if self.last_hit is not None:
+            hits = np.concatenate(([self.last_hit], hits))
+        self.last_hit = int(hits[-1])
+        gaps = np.minimum(np.diff(hits) - 1, self.max_gap)
+        self.counts += np.bincount(gaps, minlength=self.max_gap + 1)
+
+    def p_value(self):
+        p = self.high - self.low
+        probabilities = p * (1 - p) ** np.arange(self.max_gap + 1)
+        probabilities[-1] = (1 - p) ** self.max_gap
+        return chi_square_p_value(self.counts, probabilities * self.counts.sum())
+
+
+class BirthdaySpacingsTest:
+    # Marsaglia: duplicate spacings among `birthdays` days drawn from a circular year of 2^bits days are
+    # ~Poisson(lambda).
+    # With `resolution` (number of distinct input values) the year is capped at what the input can reach and
+    # values past the largest multiple of the year are dropped, so every day stays equally likely.
+    def __init__(self, birthdays=None, bits=MAX_BIRTHDAY_BITS, max_count=6, resolution=None):
+        if resolution is not None:
+            bits = min(bits, resolution.bit_length() - 1)
+        self.days = 1 << bits
+        # lambda ~ birthdays^3 / (4 * days) ~ 2 unless a size is forced
+        self.birthdays = round((8 * self.days) ** (1 / 3)) if birthdays is None else birthdays
+        self.resolution = resolution
+        self.counts = np.zeros(max_count + 1, dtype=np.int64)
+        self.carry = np.empty(0, dtype=np.int64)
+
+    def to_days(self, u):
+        if self.resolution is None:
+            return (u * self.days).astype(np.int64)
+        per_day = self.resolution // self.days
+        offsets = np.rint(u * self.resolution).astype(np.int64)
+        return offsets[offsets < per_day * self.days] // per_day
+
+    def update(self, u):
+        days = np.concatenate((self.carry, self.to_days(u)))
+        usable = len(days) - len(days) % self.birthdays
+        self.carry = days[usable:]
+        if usable == 0:
+            return
+        days = np.sort(days[:usable].reshape(-1, self.birthdays), axis=1)
+        # The year is circular: the last spacing wraps around to the first birthday
+        spacings = np.sort(np.diff(days, axis=1, append=days[:, :1] + self.days), axis=1)
+        duplicates = np.count_nonzero(spacings[:, 1:] == spacings[:, :-1], axis=1)
+        self.counts += np.bincount(np.minimum(duplicates, len(self.counts) - 1), minlength=len(self.counts))
+
+    def expected_duplicates(self):
+        # Leading term n^3/4m with the finite-n corrections: n(n-1)^2/4m equal pairs, less triples counted twice
+        n, m = self.birthdays, self.days
+        return n * (n - 1) ** 2 / (4 * m) - n * (n - 1) ** 2 * (n - 2) ** 2 / (18 * m ** 2)
+
+    def p_value(self):
+        # The spacings sum to the year, so the count is slightly under-dispersed next to Poisson(lambda);
+        # Binomial(n/3, lambda/(n/3)) keeps the mean and matches the simulated variance ~ lambda * (1 - 3*lambda/n)
+        lam = self.expected_duplicates()
+        trials = max(len(self.counts), round(self.birthdays / 3))
+        p = lam / trials
+        probabilities = np.array([math.comb(trials, k) * p ** k * (1 - p) ** (trials - k)
+                                  for k in range(len(self.counts))])
+        probabilities[-1] = 1 - probabilities[:-1].sum()
+        return chi_square_p_value(self.counts, probabilities * self.counts.sum())
+
+
+def default_tests(resolution=None):
+    # resolution = number of distinct input values, which sizes the birthday-spacings year
+    return {
+        "Frequency": FrequencyTest(),
+        "Serial pairs": SerialTest(2, 16),
+        "Serial triples": SerialTest(3, 8),
+        "Runs": RunsTest(),
+        "Gap": GapTest(),
+        "Birthday spacings": BirthdaySpacingsTest(resolution=resolution),
+    }
+
+
+def run_battery(next_block, n, low, high, chunk_size=CHUNK_SIZE, tests=None):
+    # Feeds n values in [low, high] from next_block(k) through every test; returns test name -> p-value
+    tests = default_tests(high - low + 1) if tests is None else tests
+    done = 0
+    while done < n:
+        block = next_block(min(chunk_size, n - done))
+        u = to_uniform(block, low, high)
+        for test in tests.values():
+            test.update(u)
+        done += len(block)
+    return {name: test.p_value() for name, test in tests.items()}
+
+
+def compare_generators(lcg, n, rng=None, chunk_size=CHUNK_SIZE):
+    rng = np.random.default_rng() if rng is None else rng
+    generator = lcg.jump(0)
+    return {
+        "LCG": run_battery(generator.generate_array, n, 0, generator.m - 1, chunk_size),
+        "System": run_battery(lambda k: generate_system_array(k, rng), n, SYSTEM_LOW, SYSTEM_HIGH, chunk_size),
+    }
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+
+from lab1.utils1 import CHUNK_SIZE
+
+FORMATS = ('raw', 'npy', 'memmap', 'txt')
+
+
+def format_from_path(path):
+    suffix = Path(path).suffix.lower()
+    if suffix == '.npy':
+        return 'npy'
+    if suffix == '.txt':
+        return 'txt'
+    return 'raw'
+
+
+def _blocks(next_block, n, chunk_size):
+    done = 0
+    while done < n:
+        block = next_block(min(chunk_size, n - done))
+        done += len(block)
+        yield done - len(block), block
+
+
+def export_sequence(next_block, n, path, fmt='raw', dtype=np.uint32, chunk_size=CHUNK_SIZE):
+    # Streams n values from next_block(k) to disk chunk by chunk; the full sequence is never held in memory
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    dtype = np.dtype(dtype)
+    if fmt != 'txt' and dtype.kind != 'u':
+        raise ValueError("Binary export requires an unsigned integer dtype.")
+    dtype = dtype.newbyteorder('<')
+
+    if fmt == 'memmap':
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n,))
+        for start, block in _blocks(next_block, n, chunk_size):
+            out[start:start + len(block)] = block
+        out.flush()
+        del out
+        return path
+
+    with open(path, 'w' if fmt == 'txt' else 'wb') as f:
+        if fmt == 'npy':
+            header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (n,)}
+            np.lib.format.write_array_header_1_0(f, header)
+        for start, block in _blocks(next_block, n, chunk_size):
+            if fmt == 'txt':
+                f.write((", " if start else "") + ", ".join(map(str, block.tolist())))
+            else:
+                f.write(np.asarray(block).astype(dtype, copy=False).tobytes())
+    return path
+
+
+def open_sequence(path, fmt=None, dtype=np.uint32):
+    # Read-only memory map over an exported binary sequence
+    fmt = fmt or format_from_path(path)
+    if fmt in ('npy', 'memmap'):
+        return np.load(path, mmap_mode='r')
+    if fmt == 'raw':
+        return np.memmap(path, dtype=np.dtype(dtype).newbyteorder('<'), mode='r')
+    raise ValueError("Text exports cannot be memory-mapped.")
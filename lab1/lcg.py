@@ -1,17 +1,190 @@
-from lab1.utils1 import (read_config)
+import copy
+
+import numpy as np
+
+from lab1.profiles import DEFAULT_PROFILE
+from lab1.utils1 import (read_config, affine_power, find_cycle, lcg_period)
+
+BLOCK_SIZE = 1 << 16
+UINT64_MASK = (1 << 64) - 1
+
+
+def modulus_kind(m):
+    if m & (m - 1) == 0:
+        return 'pow2'
+    if m > 2 and (m + 1) & m == 0:
+        return 'mersenne'
+    return 'general'
+
+
+def _mulmod_limb(A, A_float, s, m):
+    # A * s mod m for a scalar s < 2^50: the float64 quotient is off by at most one, and A*s - q*m is exact
+    # modulo 2^64, so the true remainder lands in [-m, 2m) and one signed correction each way fixes it
+    q = np.floor(A_float * (s / m)).astype(np.uint64)
+    r = (A * np.uint64(s) - q * np.uint64(m)).view(np.int64)
+    r = np.where(r < 0, r + np.int64(m), r)
+    return np.where(r >= m, r - np.int64(m), r).view(np.uint64)
+
+
+def mulmod_uint64(A, x, m):
+    # A * x mod m for uint64 residues A, x < m < 2^62: x in 32-bit limbs, each limb product reduced on its own
+    A_float = A.astype(np.float64)
+    if x < 1 << 50:
+        return _mulmod_limb(A, A_float, x, m)
+    high = _mulmod_limb(A, A_float, x >> 32, m)
+    high = _mulmod_limb(high, high.astype(np.float64), 1 << 32, m)
+    r = high + _mulmod_limb(A, A_float, x & 0xFFFFFFFF, m)
+    return np.where(r >= np.uint64(m), r - np.uint64(m), r)
+
+
+def mersenne_mulmod(A, x, k):
+    # A * x mod 2^k - 1 for 32 < k <= 62: 32-bit limb products folded with 2^k = 1, so nothing overflows uint64
+    m = np.uint64((1 << k) - 1)
+    shift = np.uint64(k)
+    xh, xl = np.uint64(x >> 32), np.uint64(x & 0xFFFFFFFF)
+    ah, al = A >> np.uint64(32), A & np.uint64(0xFFFFFFFF)
+    t = (ah * xh) << np.uint64(64 - k)
+    middle = ah * xl + al * xh
+    t += middle >> np.uint64(k - 32)
+    t += (middle & np.uint64((1 << (k - 32)) - 1)) << np.uint64(32)
+    low = al * xl
+    t += (low & m) + (low >> shift)
+    t = (t & m) + (t >> shift)
+    t = (t & m) + (t >> shift)
+    return np.where(t >= m, t - m, t)
 
 
 class LCG:
-    def __init__(self):
-        self.a, self.c, self.m, self.seed = read_config()
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.a, self.c, self.m, self.seed = read_config(profile)
         self.current = self.seed
+        self._tables = None
+        self._select_kernels()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_step'], state['_block']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._select_kernels()
+
+    def _select_kernels(self):
+        # Picks the scalar and block stepping kernels once from the shape of m; all produce identical output.
+        # For m <= 2^32 NumPy's uint64 % by a scalar is already cheaper than Mersenne folding, so only
+        # wider Mersenne moduli get the folding kernel.
+        self.kind = modulus_kind(self.m)
+        self._bits = self.m.bit_length() - (self.kind == 'pow2')
+        self._step = self._step_pow2 if self.kind == 'pow2' else self.step
+
+        if self.kind == 'pow2' and self.m <= 1 << 64:
+            self._block = self._block_pow2
+        elif self.m <= 1 << 32:
+            self._block = self._block_general
+        elif self.kind == 'mersenne' and self._bits <= 62:
+            self._block = self._block_mersenne
+        elif self.m < 1 << 62:
+            self._block = self._block_mulmod
+        else:
+            self._block = None
 
     def next(self):
-        self.current = (self.a * self.current + self.c) % self.m
+        self.current = self._step(self.current)
         return self.current
 
+    def step(self, x):
+        return (self.a * x + self.c) % self.m
+
+    def _step_pow2(self, x):
+        return (self.a * x + self.c) & (self.m - 1)
+
+    def cycle(self, analytic=True):
+        if analytic:
+            return lcg_period(self.a, self.c, self.m, self.current)
+        return find_cycle(self._step, self.current)
+
     def reset(self):
         self.current = self.seed
 
-    def generate_sequence(self, n):
+    def skip(self, n):
+        if n < 0:
+            raise ValueError("Cannot skip a negative number of steps.")
+        A, C = affine_power(self.a, self.c, self.m, n)
+        self.current = (A * self.current + C) % self.m
+        return self.current
+
+    def jump(self, n):
+        clone = copy.copy(self)
+        clone.skip(n)
+        return clone
+
+    def split(self, k, length=None):
+        # k substreams `length` steps apart; by default the period is divided evenly between them
+        if k <= 0:
+            raise ValueError("Number of substreams must be positive.")
+        if length is None:
+            length = self.cycle()[1] // k
+            if length == 0:
+                raise ValueError("More substreams than the period has values.")
+        return [self.jump(i * length) for i in range(k)]
+
+    def dtype(self):
+        if self.m <= 1 << 32:
+            return np.uint32
+        if self.m <= 1 << 64:
+            return np.uint64
+        return object
+
+    def block_tables(self, size):
+        # Row j holds (a^(j+1), c*(a^j + ... + 1)) mod m, so x_{k+j+1} = A[j]*x_k + C[j] for a whole block at once
+        if self._tables is None or len(self._tables[0]) < size:
+            A = np.empty(size, dtype=np.uint64)
+            C = np.empty(size, dtype=np.uint64)
+            pa, pc = 1, 0
+            for j in range(size):
+                pa, pc = (self.a * pa) % self.m, (self.a * pc + self.c) % self.m
+                A[j], C[j] = pa, pc
+            self._tables = A, C
+        return self._tables
+
+    def _block_pow2(self, A, C, x):
+        # uint64 arithmetic wraps modulo 2^64, so masking gives the exact residue for any m = 2^k <= 2^64
+        return (A * np.uint64(x) + C) & np.uint64((self.m - 1) & UINT64_MASK)
+
+    def _block_mersenne(self, A, C, x):
+        m = np.uint64(self.m)
+        t = mersenne_mulmod(A, x, self._bits) + C
+        return np.where(t >= m, t - m, t)
+
+    def _block_general(self, A, C, x):
+        return (A * np.uint64(x) + C) % np.uint64(self.m)
+
+    def _block_mulmod(self, A, C, x):
+        m = np.uint64(self.m)
+        t = mulmod_uint64(A, x, self.m) + C
+        return np.where(t >= m, t - m, t)
+
+    def generate_array(self, n, block_size=BLOCK_SIZE):
+        out = np.empty(n, dtype=self.dtype())
+        if n == 0:
+            return out
+        if self._block is None:
+            for i in range(n):
+                out[i] = self.next()
+            return out
+
+        A, C = self.block_tables(min(n, block_size))
+        size = min(len(A), block_size)
+        x = self.current
+        for start in range(0, n, size):
+            count = min(size, n - start)
+            out[start:start + count] = self._block(A[:count], C[:count], x)
+            x = int(out[start + count - 1])
+        self.current = x
+        return out
+
+    def generate_sequence(self, n, as_array=False):
+        if as_array:
+            return self.generate_array(n)
         return [self.next() for _ in range(n)]
@@ -0,0 +1,35 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from lab1.utils1 import CHUNK_SIZE, PiAccumulator, pi_from_counts
+
+
+def count_coprime_pairs(generator, count, chunk_size=CHUNK_SIZE):
+    accumulator = PiAccumulator()
+    done = 0
+    while done < count:
+        block = generator.generate_array(min(chunk_size, count - done))
+        accumulator.update(block)
+        done += len(block)
+    return accumulator.coprime, accumulator.pairs
+
+
+def estimate_pi_parallel(generator, n, workers=None, chunk_size=CHUNK_SIZE):
+    # Each worker jumps straight to its own even-aligned slice of the stream, so pairs never straddle workers
+    # and the reduced counts (hence the estimate) are identical to a serial run over the same n values.
+    workers = workers or os.cpu_count() or 1
+    slice_size = 2 * -(-(n // 2) // workers)
+    starts = list(range(0, n - n % 2, slice_size)) if slice_size else []
+    generators = [generator.jump(start) for start in starts]
+    counts = [min(slice_size, n - start) for start in starts]
+
+    if workers == 1 or len(starts) <= 1:
+        results = [count_coprime_pairs(g, count, chunk_size) for g, count in zip(generators, counts)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(count_coprime_pairs, generators, counts, [chunk_size] * len(starts)))
+
+    generator.skip(n)
+    coprime = sum(result[0] for result in results)
+    pairs = sum(result[1] for result in results)
+    return pi_from_counts(coprime, pairs)
@@ -0,0 +1,126 @@
+import ast
+import operator
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).parent / 'config.txt'
+DEFAULT_PROFILE = 'default'
+REQUIRED_KEYS = ('a', 'c', 'm', 'seed')
+MAX_EXPONENT = 4096
+MAX_RESULT_BITS = 1 << 16
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitAnd: operator.and_,
+    ast.BitXor: operator.xor,
+}
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _evaluate(node):
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return _UNARY_OPERATORS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, (ast.Pow, ast.LShift)) and not 0 <= right <= MAX_EXPONENT:
+            raise ValueError(f"Exponent out of range: {right}")
+        # Bound the result before computing it, so nested powers cannot grow without limit
+        if isinstance(node.op, ast.Pow):
+            size = left.bit_length() * right
+        elif isinstance(node.op, ast.LShift):
+            size = left.bit_length() + right
+        else:
+            size = 0
+        result = _BINARY_OPERATORS[type(node.op)](left, right) if size <= MAX_RESULT_BITS else None
+        if result is None or result.bit_length() > MAX_RESULT_BITS:
+            raise ValueError(f"Result too large: more than {MAX_RESULT_BITS} bits")
+        return result
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+
+def parse_expression(text):
+    # Integer arithmetic only (e.g. 2**10-1); anything else is rejected instead of being eval()'d
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {text!r}") from e
+    return _evaluate(tree.body)
+
+
+def parse_profiles(text):
+    # Lines before any [section] belong to the default profile; other sections inherit from it
+    profiles = {DEFAULT_PROFILE: {}}
+    current = profiles[DEFAULT_PROFILE]
+    for number, raw_line in enumerate(text.splitlines(), 1):
+        line = raw_line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            current = profiles.setdefault(line[1:-1].strip(), {})
+            continue
+        if '=' not in line:
+            raise ValueError(f"Line {number}: expected key=value, got {raw_line!r}")
+        key, value = line.split('=', 1)
+        try:
+            current[key.strip()] = parse_expression(value)
+        except ValueError as e:
+            raise ValueError(f"Line {number}: {e}") from e
+
+    base = profiles[DEFAULT_PROFILE]
+    resolved = {}
+    for name, values in profiles.items():
+        merged = {**base, **values}
+        if name == DEFAULT_PROFILE and not values and len(profiles) > 1:
+            continue
+        missing = [key for key in REQUIRED_KEYS if key not in merged]
+        if missing:
+            raise ValueError(f"Profile [{name}] is missing: {', '.join(missing)}")
+        if merged['m'] <= 0:
+            raise ValueError(f"Profile [{name}]: modulus must be positive")
+        resolved[name] = merged
+    return resolved
+
+
+def load_profiles(path=DEFAULT_PATH):
+    # Parsed once per file; re-read only when the file's mtime or size changes
+    path = os.fspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    with open(path, "r") as f:
+        profiles = parse_profiles(f.read())
+    with _lock:
+        _cache[path] = (key, profiles)
+    return profiles
+
+
+def get_profile(name=DEFAULT_PROFILE, path=DEFAULT_PATH):
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise KeyError(f"Unknown generator profile: {name}")
+    return profiles[name]
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
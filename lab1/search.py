@@ -0,0 +1,223 @@
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+from lab1.profiles import parse_expression
+from lab1.utils1 import carmichael, factorize, multiplicative_order, satisfies_hull_dobell
+
+DIMENSIONS = range(2, 7)
+# gamma_t^t for the Hermite constants of dimensions 2..8: shortest vector <= sqrt(gamma_t) * det^(1/t)
+HERMITE_POWERS = {2: 4 / 3, 3: 2, 4: 4, 5: 8, 6: 64 / 3, 7: 64, 8: 256}
+
+
+def dual_lattice_basis(a, m, t):
+    # Vectors s with s_1 + s_2*a + ... + s_t*a^(t-1) = 0 (mod m): the lattice the spectral test measures
+    basis = []
+    for i in range(t):
+        row = [0] * t
+        if i == 0:
+            row[0] = m
+        else:
+            row[0] = -pow(a, i, m)
+            row[i] = 1
+        basis.append(row)
+    return basis
+
+
+def _dot(u, v):
+    return sum(x * y for x, y in zip(u, v))
+
+
+def lll_reduce(basis, delta=Fraction(3, 4)):
+    # Exact rational LLL with incremental Gram-Schmidt updates (Cohen, Algorithm 2.6.3)
+    basis = [list(row) for row in basis]
+    n = len(basis)
+    mu = [[Fraction(0)] * n for _ in range(n)]
+    norms = []
+    ortho = []
+    for i in range(n):
+        v = [Fraction(x) for x in basis[i]]
+        for j in range(i):
+            mu[i][j] = _dot(basis[i], ortho[j]) / norms[j]
+            v = [x - mu[i][j] * y for x, y in zip(v, ortho[j])]
+        ortho.append(v)
+        norms.append(_dot(v, v))
+
+    def size_reduce(k, j):
+        q = round(mu[k][j])
+        if q:
+            basis[k] = [x - q * y for x, y in zip(basis[k], basis[j])]
+            for i in range(j):
+                mu[k][i] -= q * mu[j][i]
+            mu[k][j] -= q
+
+    k = 1
+    while k < n:
+        size_reduce(k, k - 1)
+        if norms[k] >= (delta - mu[k][k - 1] ** 2) * norms[k - 1]:
+            for j in range(k - 2, -1, -1):
+                size_reduce(k, j)
+            k += 1
+            continue
+
+        m = mu[k][k - 1]
+        merged = norms[k] + m * m * norms[k - 1]
+        mu[k][k - 1] = m * norms[k - 1] / merged
+        norms[k] = norms[k - 1] * norms[k] / merged
+        norms[k - 1] = merged
+        basis[k], basis[k - 1] = basis[k - 1], basis[k]
+        for j in range(k - 1):
+            mu[k][j], mu[k - 1][j] = mu[k - 1][j], mu[k][j]
+        for i in range(k + 1, n):
+            t = mu[i][k]
+            mu[i][k] = mu[i][k - 1] - m * t
+            mu[i][k - 1] = t + mu[k][k - 1] * mu[i][k]
+        k = max(k - 1, 1)
+    return basis
+
+
+def shortest_vector_norm2(basis):
+    # Exact squared length of the shortest nonzero lattice vector: LLL, then Fincke-Pohst enumeration
+    basis = lll_reduce(basis)
+    n = len(basis)
+    ortho, mu = [], [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        v = [float(x) for x in basis[i]]
+        for j in range(i):
+            mu[i][j] = _dot(basis[i], ortho[j]) / _dot(ortho[j], ortho[j])
+            v = [x - mu[i][j] * y for x, y in zip(v, ortho[j])]
+        ortho.append(v)
+    norms = [_dot(v, v) for v in ortho]
+
+    best = min(_dot(row, row) for row in basis)
+    coefficients = [0] * n
+
+    def search(level, partial):
+        nonlocal best
+        center = -sum(coefficients[j] * mu[j][level] for j in range(level + 1, n))
+        radius = math.sqrt(max(best - partial, 0) / norms[level]) + 1e-9
+        for x in range(math.ceil(center - radius), math.floor(center + radius) + 1):
+            coefficients[level] = x
+            length = partial + (x - center) ** 2 * norms[level]
+            if length > best * (1 + 1e-9):
+                continue
+            if level > 0:
+                search(level - 1, length)
+            elif any(coefficients):
+                vector = [sum(c * row[i] for c, row in zip(coefficients, basis)) for i in range(n)]
+                best = min(best, _dot(vector, vector))
+        coefficients[level] = 0
+
+    search(n - 1, 0.0)
+    return best
+
+
+def spectral_test(a, m, dimensions=DIMENSIONS):
+    # Normalised figure of merit per dimension: nu_t / (sqrt(gamma_t) * m^(1/t)), in (0, 1], higher is better
+    merits = {}
+    for t in dimensions:
+        nu = math.sqrt(shortest_vector_norm2(dual_lattice_basis(a, m, t)))
+        merits[t] = nu / (math.sqrt(HERMITE_POWERS[t] ** (1 / t)) * m ** (1 / t))
+    return merits
+
+
+def valid_increments(a, m, increments):
+    # c != 0 must satisfy Hull-Dobell; c = 0 needs a of maximal multiplicative order (a primitive root for prime m)
+    valid = []
+    for c in increments:
+        if c:
+            if satisfies_hull_dobell(a, c, m):
+                valid.append(c)
+        elif math.gcd(a, m) == 1 and multiplicative_order(a, m) == carmichael(m):
+            valid.append(c)
+    return valid
+
+
+def score_multiplier(a, m, increments, dimensions):
+    increments = valid_increments(a, m, increments)
+    if not increments:
+        return None
+    merits = spectral_test(a, m, dimensions)
+    return a, increments, merits
+
+
+def candidate_multipliers(m, samples, seed=None, step=1):
+    # Multipliers a = 1 + step*k in [2, m); exhaustive when there are at most `samples` of them
+    count = (m - 2) // step
+    if count <= samples:
+        return [1 + step * k for k in range(1, count + 1)]
+    rng = random.Random(seed)
+    chosen = set()
+    while len(chosen) < samples:
+        chosen.add(rng.randrange(1, count + 1))
+    return sorted(1 + step * k for k in chosen)
+
+
+def hull_dobell_step(m):
+    # Hull-Dobell needs a - 1 divisible by every prime of m (and by 4 when 4 | m): sample only those a
+    step = 1
+    for p in factorize(m):
+        step *= p
+    if m % 4 == 0:
+        step = step * 2 if step % 4 else step
+    return step
+
+
+def search_parameters(m, multipliers=None, increments=(1,), dimensions=DIMENSIONS, workers=None, top=10,
+                      samples=1000, seed=None):
+    # Returns the `top` (a, c) pairs for modulus m ranked by the worst normalised spectral-test merit
+    if multipliers is None:
+        step = hull_dobell_step(m) if 0 not in increments else 1
+        multipliers = candidate_multipliers(m, samples, seed, step)
+    multipliers = list(multipliers)
+    dimensions = list(dimensions)
+    workers = workers or os.cpu_count() or 1
+    arguments = ([m] * len(multipliers), [tuple(increments)] * len(multipliers), [dimensions] * len(multipliers))
+
+    if workers == 1:
+        scored = list(map(score_multiplier, multipliers, *arguments))
+    else:
+        chunksize = max(1, len(multipliers) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scored = list(executor.map(score_multiplier, multipliers, *arguments, chunksize=chunksize))
+
+    ranked = []
+    for result in scored:
+        if result is None:
+            continue
+        a, valid, merits = result
+        for c in valid:
+            ranked.append({'a': a, 'c': c, 'm': m, 'score': min(merits.values()), 'merits': merits})
+    ranked.sort(key=lambda entry: (-entry['score'], entry['a'], entry['c']))
+    return ranked[:top]
+
+
+def format_profile(entry, name=None, seed=1):
+    lines = [f"[{name}]"] if name else []
+    lines += [f"a={entry['a']}", f"c={entry['c']}", f"m={entry['m']}", f"seed={seed}"]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank LCG parameters for a modulus by the spectral test.")
+    parser.add_argument("m", type=parse_expression, help="modulus, e.g. 2**32")
+    parser.add_argument("--increments", type=int, nargs="+", default=[1])
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    results = search_parameters(args.m, increments=args.increments, workers=args.workers, top=args.top,
+                                samples=args.samples, seed=args.seed)
+    for rank, entry in enumerate(results, 1):
+        merits = " ".join(f"S{t}={value:.3f}" for t, value in entry['merits'].items())
+        print(f"# {rank}: score={entry['score']:.4f} {merits}")
+        print(format_profile(entry, name=f"search{rank}"))
+
+
+if __name__ == "__main__":
+    main()
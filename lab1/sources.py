@@ -0,0 +1,104 @@
+import abc
+import os
+import random
+
+import numpy as np
+
+from lab1.lcg import LCG
+from lab1.utils1 import CHUNK_SIZE
+
+
+class EntropySource(abc.ABC):
+    # Bulk byte API: fill() writes straight into any writable buffer, random_bytes() allocates one
+    @abc.abstractmethod
+    def fill(self, buffer):
+        pass
+
+    def random_bytes(self, n):
+        buffer = bytearray(n)
+        self.fill(buffer)
+        return bytes(buffer)
+
+    def block_reader(self, dtype=np.uint32):
+        # next_block(k) callable for stream_statistics / run_battery, k little-endian words per call
+        dtype = np.dtype(dtype).newbyteorder('<')
+
+        def next_block(k):
+            buffer = np.empty(k, dtype=dtype)
+            self.fill(buffer)
+            return buffer
+
+        return next_block
+
+
+def _byte_view(buffer):
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError("fill() needs a writable buffer.")
+    return view.cast('B') if view.format != 'B' or view.ndim != 1 else view
+
+
+class LCGSource(EntropySource):
+    # Emits the low whole bytes of each value that [0, m) covers uniformly, e.g. 4 bytes/value for m = 2^32
+    def __init__(self, generator=None, chunk_size=CHUNK_SIZE):
+        self.generator = LCG() if generator is None else generator
+        self.width = max(1, (self.generator.m.bit_length() - 1) // 8)
+        self.chunk_size = chunk_size
+
+    def fill(self, buffer):
+        target = np.frombuffer(_byte_view(buffer), dtype=np.uint8)
+        step = self.chunk_size * self.width
+        for start in range(0, len(target), step):
+            count = min(step, len(target) - start)
+            values = self.generator.generate_array(-(-count // self.width)).astype('<u8')
+            target[start:start + count] = values.view(np.uint8).reshape(-1, 8)[:, :self.width].reshape(-1)[:count]
+        return buffer
+
+
+class RandomSource(EntropySource):
+    def __init__(self, rng=None):
+        self.rng = random.Random() if rng is None else rng
+
+    def fill(self, buffer):
+        view = _byte_view(buffer)
+        view[:] = self.rng.randbytes(len(view))
+        return buffer
+
+
+class UrandomSource(EntropySource):
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def fill(self, buffer):
+        view = _byte_view(buffer)
+        for start in range(0, len(view), self.chunk_size):
+            count = min(self.chunk_size, len(view) - start)
+            view[start:start + count] = os.urandom(count)
+        return buffer
+
+
+class NumpySource(EntropySource):
+    def __init__(self, rng=None, chunk_size=CHUNK_SIZE):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.chunk_size = chunk_size
+
+    def fill(self, buffer):
+        view = _byte_view(buffer)
+        for start in range(0, len(view), self.chunk_size):
+            count = min(self.chunk_size, len(view) - start)
+            view[start:start + count] = self.rng.bytes(count)
+        return buffer
+
+
+SOURCES = {
+    'lcg': LCGSource,
+    'random': RandomSource,
+    'urandom': UrandomSource,
+    'numpy': NumpySource,
+}
+
+
+def get_source(name, *args, **kwargs):
+    if name not in SOURCES:
+        raise ValueError(f"Unknown entropy source: {name}")
+    return SOURCES[name](*args, **kwargs)
@@ -1,8 +1,11 @@
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+import numpy as np
+
 import styles
-from lab1 import lcg, utils1
+from lab1 import export, lcg, utils1
 
 
 class UI:
@@ -13,6 +16,9 @@ class UI:
         self.master.configure(bg=styles.COLORS['bg_main'])
         self.style = styles.apply_styles(self.master)
         self.lcg_generator = lcg.LCG()
+        self.last_run = None
+        self.is_operation_running = False
+        self.cancel_event = threading.Event()
         self.create_widgets()
 
     def create_widgets(self):
@@ -27,7 +33,19 @@ class UI:
         ttk.Label(input_frame, text="Enter length of random sequence:").pack(side=tk.LEFT, padx=(0, 10))
         self.input_field = ttk.Entry(input_frame, width=15)
         self.input_field.pack(side=tk.LEFT)
-        ttk.Button(input_frame, text="Generate", command=self.generate_sequences).pack(side=tk.LEFT, padx=(10, 0))
+        self.generate_button = ttk.Button(input_frame, text="Generate", command=self.generate_sequences)
+        self.generate_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.cancel_button = ttk.Button(input_frame, text="Cancel", command=self.cancel_operation_handler,
+                                        state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+
+        progress_frame = ttk.Frame(main_container)
+        progress_frame.pack(fill=tk.X, pady=(10, 0))
+        self.progress_identifier = ttk.Label(progress_frame, text="")
+        self.progress_identifier.pack(anchor=tk.W, pady=(0, 5))
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100)
+        self.progress_bar.pack(fill=tk.X)
 
         results_frame = ttk.Frame(main_container)
         results_frame.pack(expand=True, fill=tk.BOTH, pady=20)
@@ -59,10 +77,12 @@ class UI:
         button_frame = ttk.Frame(main_container)
         button_frame.pack(pady=20)
 
-        ttk.Button(button_frame, text="Save LCG Sequence", command=lambda: self.save_sequence("lcg")).pack(side=tk.LEFT,
-                                                                                                           padx=5)
-        ttk.Button(button_frame, text="Save System Sequence", command=lambda: self.save_sequence("system")).pack(
-            side=tk.LEFT, padx=5)
+        self.save_lcg_button = ttk.Button(button_frame, text="Save LCG Sequence",
+                                          command=lambda: self.save_sequence("lcg"))
+        self.save_lcg_button.pack(side=tk.LEFT, padx=5)
+        self.save_system_button = ttk.Button(button_frame, text="Save System Sequence",
+                                             command=lambda: self.save_sequence("system"))
+        self.save_system_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Close", command=self.master.destroy).pack(side=tk.LEFT, padx=5)
 
     def generate_sequences(self):
@@ -77,39 +97,130 @@ class UI:
             messagebox.showerror("Error", "You should enter a number, not text.")
             return
 
-        lcg_seq = self.lcg_generator.generate_sequence(n)
-        system_seq = utils1.generate_system_sequence(n)
+        lcg_start = self.lcg_generator.jump(0)
+        system_seed = np.random.SeedSequence().entropy
 
         self.lcg_result.delete(1.0, tk.END)
         self.system_result.delete(1.0, tk.END)
 
         if n < 1000:
+            lcg_seq = lcg_start.jump(0).generate_array(n)
+            system_seq = utils1.generate_system_array(n, np.random.default_rng(system_seed))
             self.lcg_result.insert(tk.END, ", ".join(map(str, lcg_seq)))
             self.system_result.insert(tk.END, ", ".join(map(str, system_seq)))
         else:
             self.lcg_result.insert(tk.END, "Too many numbers to display")
             self.system_result.insert(tk.END, "Too many numbers to display")
 
-        lcg_period = utils1.calculate_period(lcg_seq)
-        system_period = utils1.calculate_period(system_seq)
-        lcg_pi_estimate = utils1.estimate_pi(lcg_seq)
-        system_pi_estimate = utils1.estimate_pi(system_seq)
+        # Recorded up front, so Save exports the values on screen even if this run is cancelled
+        self.last_run = (lcg_start, system_seed, n)
+        self.lcg_result_label.config(text="")
+        self.system_result_label.config(text="")
+        self.set_ui_state('disabled')
+        self.progress_var.set(0)
+        self.set_progress_identifier(f"Analysing {n} values...")
+        self.cancel_event = threading.Event()
+        threading.Thread(target=self._generate_thread, args=(lcg_start, system_seed, n, self.cancel_event),
+                         daemon=True).start()
+
+    def _generate_thread(self, lcg_start, system_seed, n, cancel_event):
+        generator = lcg_start.jump(0)
+        system_rng = np.random.default_rng(system_seed)
+
+        lcg_stats = utils1.stream_statistics(generator.generate_array, n, generator.m,
+                                             progress_callback=self._stream_callback(self.lcg_result_label, n, 0,
+                                                                                     cancel_event))
+        if lcg_stats is None:
+            return
+        system_stats = utils1.stream_statistics(lambda k: utils1.generate_system_array(k, system_rng), n,
+                                                utils1.SYSTEM_HIGH + 1,
+                                                progress_callback=self._stream_callback(self.system_result_label, n,
+                                                                                        50, cancel_event))
+        if system_stats is None:
+            return
 
-        lcg_pi_text = f"{lcg_pi_estimate:.6f}" if isinstance(lcg_pi_estimate, float) else str(lcg_pi_estimate)
-        system_pi_text = f"{system_pi_estimate:.6f}" if isinstance(system_pi_estimate, float) else str(
-            system_pi_estimate)
+        lcg_period, lcg_pi_estimate = lcg_stats
+        if lcg_period is None:
+            mu, lam = lcg_start.cycle()
+            lcg_period = min(n, max(mu - 1, 0) + lam)
+        if not cancel_event.is_set():
+            self.master.after(0, self._finish_generation, cancel_event, generator.current,
+                              (lcg_period, lcg_pi_estimate), system_stats)
+
+    def _stream_callback(self, label, n, base, cancel_event):
+        def progress_callback(done, period, pi_estimate):
+            if cancel_event.is_set():
+                return False
+            self.master.after(0, self._show_partial, cancel_event, label, base + 50 * done / n, period, pi_estimate,
+                              done)
+            return True
+
+        return progress_callback
+
+    def _show_partial(self, cancel_event, label, progress, period, pi_estimate, done):
+        if cancel_event.is_set():
+            return
+        self.progress_var.set(progress)
+        period_text = f"≥ {done}" if period is None else str(period)
+        label.config(text=self.format_statistics(period_text, pi_estimate))
 
-        self.lcg_result_label.config(text=f"Period: {lcg_period}\nπ Estimate: {lcg_pi_text}")
-        self.system_result_label.config(text=f"Period: {system_period}\nπ Estimate: {system_pi_text}")
+    def _finish_generation(self, cancel_event, lcg_state, lcg_stats, system_stats):
+        if cancel_event.is_set():
+            return
+        self.lcg_generator.current = lcg_state
+        self.lcg_result_label.config(text=self.format_statistics(*lcg_stats))
+        self.system_result_label.config(text=self.format_statistics(*system_stats))
+        self.progress_var.set(100)
+        self.set_progress_identifier("Generation completed")
+        self.set_ui_state('normal')
+
+    @staticmethod
+    def format_statistics(period, pi_estimate):
+        pi_text = f"{pi_estimate:.6f}" if isinstance(pi_estimate, float) else str(pi_estimate)
+        return f"Period: {period}\nπ Estimate: {pi_text}"
+
+    def set_ui_state(self, state):
+        for element in (self.input_field, self.generate_button, self.save_lcg_button, self.save_system_button):
+            element.config(state=state)
+        self.is_operation_running = (state == 'disabled')
+        self.cancel_button.config(state='normal' if state == 'disabled' else 'disabled')
+
+    def set_progress_identifier(self, text):
+        self.progress_identifier.config(text=text)
+
+    def cancel_operation_handler(self):
+        self.cancel_event.set()
+        self.set_progress_identifier("Operation cancelled")
+        self.set_ui_state('normal')
+        self.progress_var.set(0)
 
     def save_sequence(self, seq_type):
-        filename = filedialog.asksaveasfilename(defaultextension=".txt")
-        if filename:
-            with open(filename, "w") as f:
-                if seq_type == "lcg":
-                    f.write(self.lcg_result.get(1.0, tk.END))
-                else:
-                    f.write(self.system_result.get(1.0, tk.END))
+        if self.last_run is None:
+            messagebox.showwarning("Warning", "Generate a sequence first.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".txt",
+                                                filetypes=[("Text", "*.txt"), ("NumPy array", "*.npy"),
+                                                           ("Raw little-endian", "*.bin")])
+        if not filename:
+            return
+
+        lcg_start, system_seed, n = self.last_run
+        if seq_type == "lcg":
+            generator = lcg_start.jump(0)
+            next_block, dtype = generator.generate_array, generator.dtype()
+        else:
+            rng = np.random.default_rng(system_seed)
+            next_block, dtype = (lambda k: utils1.generate_system_array(k, rng)), np.uint32
+        # .npy is written through a memory map, so the file is filled in place chunk by chunk
+        fmt = export.format_from_path(filename)
+        fmt = 'memmap' if fmt == 'npy' else fmt
+        if fmt != 'txt' and np.dtype(dtype).kind != 'u':
+            messagebox.showerror("Error", "This modulus does not fit a 64-bit integer; save the sequence as text.")
+            return
+        try:
+            export.export_sequence(next_block, n, filename, fmt, dtype)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save the sequence: {e}")
 
 
 if __name__ == "__main__":
@@ -1,26 +1,46 @@
 import math
 import random
-from pathlib import Path
+import time
+from statistics import NormalDist
 
 import numpy as np
 
+from lab1 import profiles
 
-def read_config():
-    script_dir = Path(__file__).parent
-    config_path = script_dir / 'config.txt'
-    config = {}
-    with open(config_path, "r") as f:
-        for line in f:
-            key, value = line.strip().split('=')
-            config[key] = eval(value)
+SYSTEM_LOW = 7**3 + 89
+SYSTEM_HIGH = 2**20 - 1
+CHUNK_SIZE = 1 << 20
+PERIOD_BITMAP_LIMIT = 1 << 26
+
+
+def read_config(profile=profiles.DEFAULT_PROFILE):
+    config = profiles.get_profile(profile)
     return config['a'], config['c'], config['m'], config['seed']
 
 
+def affine_power(a, c, m, n):
+    # Composes x -> a*x + c with itself n times by squaring: returns (A, C) with f^n(x) = A*x + C mod m
+    A, C = 1 % m, 0
+    while n > 0:
+        if n & 1:
+            A, C = (a * A) % m, (a * C + c) % m
+        a, c = (a * a) % m, (a * c + c) % m
+        n >>= 1
+    return A, C
+
+
 def generate_system_sequence(n):
-    return [random.randint(7**3 + 89, 2**20 - 1) for _ in range(n)]
+    return [random.randint(SYSTEM_LOW, SYSTEM_HIGH) for _ in range(n)]
+
+
+def generate_system_array(n, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.integers(SYSTEM_LOW, SYSTEM_HIGH, size=n, dtype=np.uint32, endpoint=True)
 
 
 def calculate_period(sequence):
+    if isinstance(sequence, np.ndarray):
+        sequence = sequence.tolist()
     seen = set()
     for i, value in enumerate(sequence):
         if value in seen:
@@ -29,6 +49,156 @@ def calculate_period(sequence):
     return len(sequence)
 
 
+def find_cycle(step, x0):
+    # Brent's cycle detection: O(1) memory, returns (tail length mu, period lambda) of x0, step(x0), ...
+    power = lam = 1
+    tortoise, hare = x0, step(x0)
+    while tortoise != hare:
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        hare = step(hare)
+        lam += 1
+
+    tortoise = hare = x0
+    for _ in range(lam):
+        hare = step(hare)
+    mu = 0
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(hare)
+        mu += 1
+    return mu, lam
+
+
+def is_probable_prime(n):
+    if n < 2:
+        return False
+    small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # These bases make Miller-Rabin deterministic for n < 3.3 * 10^24
+    for base in small_primes:
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    if n % 2 == 0:
+        return 2
+    for c in range(1, n):
+        x = y = 2
+        d = 1
+        while d == 1:
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            d = math.gcd(abs(x - y), n)
+        if d != n:
+            return d
+    return n
+
+
+def factorize(n):
+    factors = {}
+    for p in (2, 3, 5, 7, 11, 13):
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        x = stack.pop()
+        if is_probable_prime(x):
+            factors[x] = factors.get(x, 0) + 1
+        else:
+            d = pollard_rho(x)
+            stack += [d, x // d]
+    return dict(sorted(factors.items()))
+
+
+def satisfies_hull_dobell(a, c, m):
+    if c == 0 or math.gcd(c, m) != 1:
+        return False
+    primes = factorize(m)
+    if any((a - 1) % p for p in primes):
+        return False
+    return m % 4 != 0 or (a - 1) % 4 == 0
+
+
+def _reduce_order(order, is_identity):
+    # Strips prime factors from a known multiple of the order while the result still acts as the identity
+    for p in factorize(order):
+        while order % p == 0 and is_identity(order // p):
+            order //= p
+    return order
+
+
+def carmichael(m):
+    # Exponent of the multiplicative group mod m: the largest possible multiplicative order
+    result = 1
+    for p, e in factorize(m).items():
+        lam = (p - 1) * p ** (e - 1)
+        if p == 2 and e >= 3:
+            lam //= 2
+        result = result * lam // math.gcd(result, lam)
+    return result
+
+
+def multiplicative_order(a, m):
+    if math.gcd(a, m) != 1:
+        raise ValueError("a must be coprime to m to have a multiplicative order.")
+    if m == 1:
+        return 1
+    return _reduce_order(carmichael(m), lambda n: pow(a, n, m) == 1)
+
+
+def _prime_power_cycle(a, c, q, p, x0):
+    a, c, x0 = a % q, c % q, x0 % q
+    if a % p == 0:
+        # The map contracts onto its fixed point x* within at most e steps
+        fixed = c * pow(1 - a, -1, q) % q
+        diff, mu = (x0 - fixed) % q, 0
+        while diff:
+            diff = diff * a % q
+            mu += 1
+        return mu, 1
+
+    def is_identity(n):
+        A, C = affine_power(a, c, q, n)
+        return (A * x0 + C) % q == x0
+
+    # The affine group mod q has order q * phi(q), which every orbit length divides
+    return 0, _reduce_order(q * (q // p) * (p - 1), is_identity)
+
+
+def lcg_period(a, c, m, seed):
+    # Exact (tail, period) of seed, f(seed), ... for f(x) = a*x + c mod m, without generating the sequence
+    if satisfies_hull_dobell(a, c, m):
+        return 0, m
+    if c == 0 and math.gcd(seed, m) == 1 and math.gcd(a, m) == 1:
+        return 0, multiplicative_order(a, m)
+
+    mu, lam = 0, 1
+    for p, e in factorize(m).items():
+        tail, period = _prime_power_cycle(a, c, p ** e, p, seed)
+        mu = max(mu, tail)
+        lam = lam * period // math.gcd(lam, period)
+    return mu, lam
+
+
 def gcd(a, b):
     while b:
         a, b = b, a % b
@@ -36,6 +206,8 @@ def gcd(a, b):
 
 
 def estimate_pi(sequence):
+    if isinstance(sequence, np.ndarray):
+        sequence = sequence.tolist()
     if len(sequence) < 2:
         return "Not enough random numbers to estimate."
 
@@ -46,7 +218,120 @@ def estimate_pi(sequence):
         if gcd(x, y) == 1:
             count += 1
         total += 1
-    probability = count / total
+    return pi_from_counts(count, total)
+
+
+def pi_from_counts(coprime, pairs):
+    if pairs == 0:
+        return "Not enough random numbers to estimate."
+    probability = coprime / pairs
     if probability == 0:
         return np.inf
     return math.sqrt(6 / probability)
+
+
+def wilson_interval(successes, trials, z):
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    spread = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+def estimate_pi_adaptive(next_block, precision, confidence=0.95, batch_size=1 << 16, max_samples=10 ** 9):
+    # Draws batches until the confidence interval on pi = sqrt(6/p) is at most +-precision wide.
+    # The interval only covers sampling error, not bias in the generator itself.
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    accumulator = PiAccumulator()
+    interval = (0.0, math.inf)
+    samples = 0
+    started = time.perf_counter()
+    while samples < max_samples:
+        block = next_block(min(batch_size, max_samples - samples))
+        accumulator.update(block)
+        samples += len(block)
+        low, high = wilson_interval(accumulator.coprime, accumulator.pairs, z)
+        interval = (math.sqrt(6 / high) if high > 0 else math.inf, math.sqrt(6 / low) if low > 0 else math.inf)
+        if interval[1] - interval[0] <= 2 * precision:
+            break
+    elapsed = time.perf_counter() - started
+
+    return {
+        'pi': accumulator.result(),
+        'interval': interval,
+        'samples': samples,
+        'converged': interval[1] - interval[0] <= 2 * precision,
+        'throughput': samples / elapsed if elapsed > 0 else math.inf,
+    }
+
+
+class PeriodAccumulator:
+    # Streaming equivalent of calculate_period for values in [0, value_limit), using a fixed-size bitmap
+    def __init__(self, value_limit):
+        self.seen = np.zeros(value_limit, dtype=bool)
+        self.count = 0
+        self.period = None
+
+    def update(self, block):
+        if self.period is not None or len(block) == 0:
+            return
+        order = np.argsort(block, kind='stable')
+        ordered = block[order]
+        repeated = self.seen[block]
+        repeated[order[1:][ordered[1:] == ordered[:-1]]] = True
+        hits = np.flatnonzero(repeated)
+        if len(hits):
+            self.period = self.count + int(hits[0])
+            self.seen = None
+            return
+        self.seen[block] = True
+        self.count += len(block)
+
+    def result(self):
+        return self.count if self.period is None else self.period
+
+
+class PiAccumulator:
+    # Streaming equivalent of estimate_pi: pairs (x0, x1), (x2, x3), ... across chunk boundaries
+    def __init__(self):
+        self.coprime = 0
+        self.pairs = 0
+        self.carry = None
+
+    def update(self, block):
+        if self.carry is not None:
+            block = np.concatenate((self.carry, block))
+        usable = len(block) - len(block) % 2
+        self.carry = block[usable:] if usable < len(block) else None
+        pairs = np.gcd(block[0:usable:2], block[1:usable:2])
+        self.coprime += int(np.count_nonzero(pairs == 1))
+        self.pairs += usable // 2
+
+    def result(self):
+        return pi_from_counts(self.coprime, self.pairs)
+
+
+def stream_statistics(next_block, n, value_limit=None, chunk_size=CHUNK_SIZE, progress_callback=None):
+    # Pulls n values as fixed-size blocks from next_block(k); memory stays O(chunk_size) for any n.
+    # The period is None when value_limit is unknown or too large for the bitmap.
+    # progress_callback(done, period, pi) sees partial results after every chunk; returning False cancels (-> None).
+    period = None
+    if value_limit is not None and value_limit <= PERIOD_BITMAP_LIMIT:
+        period = PeriodAccumulator(value_limit)
+    pi = PiAccumulator()
+
+    done = 0
+    while done < n:
+        block = next_block(min(chunk_size, n - done))
+        if period is not None:
+            period.update(block)
+        pi.update(block)
+        done += len(block)
+        if progress_callback is not None:
+            partial_period = period.period if period is not None else None
+            if not progress_callback(done, partial_period, pi.result()):
+                return None
+
+    return (period.result() if period is not None else None), pi.result()
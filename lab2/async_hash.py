@@ -0,0 +1,90 @@
+import asyncio
+import weakref
+
+from lab2.md5 import DEFAULT_BACKEND, IO_SIZE, MD5Hasher
+
+BATCH_SIZE = IO_SIZE
+CONCURRENCY = 8
+
+
+class _FileReader:
+    # async read(n) over a blocking file object, each read running on the executor
+    def __init__(self, file, loop, executor):
+        self.file = file
+        self.loop = loop
+        self.executor = executor
+
+    async def read(self, n):
+        return await self.loop.run_in_executor(self.executor, self.file.read, n)
+
+
+class AsyncMD5:
+    # At most `concurrency` hashes run at once; each keeps one batch compressing on the executor while the
+    # next is read, so a hash holds at most two batches in memory and a slow consumer throttles its reader
+    def __init__(self, concurrency=CONCURRENCY, executor=None, backend=DEFAULT_BACKEND, batch_size=BATCH_SIZE):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.executor = executor
+        self.backend = backend
+        self.batch_size = batch_size
+
+    async def hash_stream(self, reader, progress_callback=None):
+        # reader is anything with `async read(n)` (asyncio.StreamReader, aiohttp payloads, ...).
+        # progress_callback(bytes_hashed) returning False cancels (-> None).
+        async with self.semaphore:
+            return await self._hash(reader, progress_callback)
+
+    async def hash_path(self, path, progress_callback=None):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            file = await loop.run_in_executor(self.executor, open, path, 'rb')
+            try:
+                return await self._hash(_FileReader(file, loop, self.executor), progress_callback)
+            finally:
+                await loop.run_in_executor(self.executor, file.close)
+
+    async def _hash(self, reader, progress_callback):
+        loop = asyncio.get_running_loop()
+        hasher = MD5Hasher(backend=self.backend)
+        pending = None
+        batch = bytearray()
+        hashed = 0
+        try:
+            while True:
+                data = await reader.read(self.batch_size - len(batch))
+                batch += data
+                if batch and (len(batch) >= self.batch_size or not data):
+                    if pending is not None:
+                        await pending
+                    pending = loop.run_in_executor(self.executor, hasher.update, batch)
+                    hashed += len(batch)
+                    batch = bytearray()
+                    if progress_callback and not progress_callback(hashed):
+                        return None
+                if not data:
+                    break
+            if pending is not None:
+                await pending
+                pending = None
+        finally:
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+        return hasher.hexdigest()
+
+
+# One default limiter per event loop: asyncio primitives cannot be shared between loops
+_defaults = weakref.WeakKeyDictionary()
+
+
+def _default():
+    loop = asyncio.get_running_loop()
+    if loop not in _defaults:
+        _defaults[loop] = AsyncMD5()
+    return _defaults[loop]
+
+
+async def hash_stream(reader, progress_callback=None):
+    return await _default().hash_stream(reader, progress_callback)
+
+
+async def hash_path(path, progress_callback=None):
+    return await _default().hash_path(path, progress_callback)
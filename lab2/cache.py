@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+import time
+
+from lab2.md5 import MD5
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".md5_cache.sqlite3")
+# Files modified this close to the moment they were hashed may change again within the same mtime tick,
+# so their digests are not cached (the "racy clean" problem)
+RACY_WINDOW_NS = 2 * 10 ** 9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+)
+"""
+
+
+def stat_key(st):
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns
+
+
+class HashCache:
+    # Digests keyed by (device, inode) and trusted only while size, mtime_ns and ctime_ns are unchanged
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(_SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def lookup(self, st):
+        dev, ino, size, mtime_ns, ctime_ns = stat_key(st)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT digest FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? AND ctime_ns = ?",
+                (dev, ino, size, mtime_ns, ctime_ns)).fetchone()
+        return row[0] if row else None
+
+    def store(self, st, digest, hashed_at_ns=None):
+        hashed_at_ns = time.time_ns() if hashed_at_ns is None else hashed_at_ns
+        if hashed_at_ns - st.st_mtime_ns < RACY_WINDOW_NS:
+            return False
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                                    (*stat_key(st), digest))
+            self.connection.commit()
+        return True
+
+    def store_many(self, entries, hashed_at_ns):
+        rows = [(*stat_key(st), digest) for st, digest in entries
+                if hashed_at_ns - st.st_mtime_ns >= RACY_WINDOW_NS]
+        with self.lock:
+            self.connection.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+        return len(rows)
+
+    def hash_file(self, file_path, md5=None, progress_callback=None, force=False):
+        # Cached digest when the stat key still matches; otherwise hash, and cache only if the file held still
+        before = os.stat(file_path)
+        if not force:
+            digest = self.lookup(before)
+            if digest is not None:
+                if progress_callback:
+                    progress_callback(100)
+                return digest
+
+        started = time.time_ns()
+        digest = (md5 or MD5()).hash_file(file_path, progress_callback)
+        if digest is not None and stat_key(os.stat(file_path)) == stat_key(before):
+            self.store(before, digest, started)
+        return digest
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM hashes")
+            self.connection.commit()
@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from lab2.md5 import DEFAULT_BACKEND, IO_SIZE, MD5Hasher
+
+CHUNK_SIZE = 4 * 1024 * 1024
+EXTENSION = '.md5chunks'
+HEADER = 'MD5CHUNKS 1'
+
+
+def chunk_ranges(size, chunk_size=CHUNK_SIZE):
+    return [(offset, min(chunk_size, size - offset)) for offset in range(0, size, chunk_size)]
+
+
+def root_digest(digests):
+    # MD5 over the concatenated binary chunk digests: one value that covers the whole map
+    return MD5Hasher(b''.join(bytes.fromhex(digest) for digest in digests)).hexdigest()
+
+
+def _pread(fd, length, offset):
+    if hasattr(os, 'pread'):
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+def hash_ranges(path, ranges, backend=DEFAULT_BACKEND):
+    # Offset-based reads, so any number of workers can share the file without seeking each other's handles.
+    # A range cut short by EOF hashes only the bytes present.
+    digests = []
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        for offset, length in ranges:
+            hasher = MD5Hasher(backend=backend)
+            end = offset + length
+            while offset < end:
+                data = _pread(fd, min(IO_SIZE, end - offset), offset)
+                if not data:
+                    break
+                hasher.update(data)
+                offset += len(data)
+            digests.append(hasher.hexdigest())
+    finally:
+        os.close(fd)
+    return digests
+
+
+def _hash_chunks(path, ranges, workers, backend, progress_callback):
+    # Digests of ranges, in order; consecutive ranges are batched so each task opens the file once
+    workers = workers or os.cpu_count() or 1
+    per_task = max(1, -(-len(ranges) // (workers * 4)))
+    tasks = [ranges[i:i + per_task] for i in range(0, len(ranges), per_task)]
+    if workers == 1 or len(tasks) < 2:
+        results = (hash_ranges(path, task, backend) for task in tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(hash_ranges, [path] * len(tasks), tasks, [backend] * len(tasks))
+    digests = []
+    try:
+        for batch in results:
+            digests.extend(batch)
+            if progress_callback and not progress_callback(len(digests), len(ranges)):
+                return None
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return digests
+
+
+def build_chunk_map(path, chunk_size=CHUNK_SIZE, workers=None, backend=DEFAULT_BACKEND, progress_callback=None):
+    size = os.path.getsize(path)
+    digests = _hash_chunks(path, chunk_ranges(size, chunk_size), workers, backend, progress_callback)
+    if digests is None:
+        return None
+    return {'size': size, 'chunk_size': chunk_size, 'digests': digests, 'root': root_digest(digests)}
+
+
+def write_chunk_map(path, map_path=None, chunk_size=CHUNK_SIZE, workers=None, backend=DEFAULT_BACKEND,
+                    progress_callback=None):
+    # Sidecar layout: header with chunk size and file size, one chunk digest per line, then the root digest
+    chunk_map = build_chunk_map(path, chunk_size, workers, backend, progress_callback)
+    if chunk_map is None:
+        return None
+    map_path = path + EXTENSION if map_path is None else map_path
+    with open(map_path, 'w', encoding='ascii', newline='\n') as f:
+        f.write(f"{HEADER} {chunk_size} {chunk_map['size']}\n")
+        f.writelines(digest + '\n' for digest in chunk_map['digests'])
+        f.write(f"root {chunk_map['root']}\n")
+    return chunk_map
+
+
+def read_chunk_map(map_path):
+    with open(map_path, 'r', encoding='ascii') as f:
+        lines = f.read().split()
+    try:
+        if ' '.join(lines[:2]) != HEADER or lines[-2] != 'root':
+            raise ValueError
+        chunk_size, size = int(lines[2]), int(lines[3])
+        digests, root = [digest.lower() for digest in lines[4:-2]], lines[-1].lower()
+    except (IndexError, ValueError):
+        raise ValueError(f"Not a chunk map: {map_path}")
+    if len(digests) != len(chunk_ranges(size, chunk_size)) or root_digest(digests) != root:
+        raise ValueError(f"Chunk map is damaged: {map_path}")
+    return {'size': size, 'chunk_size': chunk_size, 'digests': digests, 'root': root}
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def verify_chunk_map(path, map_path=None, start=0, end=None, workers=None, backend=DEFAULT_BACKEND,
+                     progress_callback=None):
+    # Re-hashes only the chunks overlapping [start, end) and reports corrupted byte ranges as (start, end) pairs.
+    # A changed file size marks everything past the shorter length as corrupted.
+    chunk_map = read_chunk_map(path + EXTENSION if map_path is None else map_path)
+    size, chunk_size = chunk_map['size'], chunk_map['chunk_size']
+    actual_size = os.path.getsize(path)
+    end = max(size, actual_size) if end is None else end
+    if not 0 <= start <= end:
+        raise ValueError("Invalid byte range.")
+
+    first, last = start // chunk_size, min(-(-end // chunk_size), len(chunk_map['digests']))
+    ranges = chunk_ranges(size, chunk_size)[first:last]
+    digests = _hash_chunks(path, ranges, workers, backend, progress_callback)
+    if digests is None:
+        return None
+
+    corrupted = [(offset, offset + length) for (offset, length), digest, expected
+                 in zip(ranges, digests, chunk_map['digests'][first:last]) if digest != expected]
+    if actual_size != size and end > min(size, actual_size):
+        corrupted.append((max(start, min(size, actual_size)), min(end, max(size, actual_size))))
+    corrupted = _merge_ranges(sorted(corrupted))
+    return {'ok': not corrupted, 'corrupted': corrupted, 'checked': (start, end), 'chunks': len(ranges),
+            'size': actual_size, 'expected_size': size}
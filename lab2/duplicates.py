@@ -0,0 +1,134 @@
+import filecmp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from lab2.manifest import iter_files
+from lab2.md5 import DEFAULT_BACKEND, MD5
+
+SAMPLE_SIZE = 16 * 1024
+
+
+def scan_files(roots, min_size=1):
+    # (path, size) of regular files under roots; extra hard links to an inode already seen are skipped,
+    # since deleting them would free nothing
+    seen = set()
+    files = []
+    for root in roots:
+        for entry in iter_files(root):
+            st = entry.stat(follow_symlinks=False)
+            if st.st_size < min_size or (st.st_dev, st.st_ino) in seen:
+                continue
+            seen.add((st.st_dev, st.st_ino))
+            files.append((entry.path, st.st_size))
+    files.sort()
+    return files
+
+
+def sample_digest(path, size, sample_size=SAMPLE_SIZE, backend=DEFAULT_BACKEND):
+    # MD5 of the first and last sample_size bytes; the whole file when it is no longer than both together
+    try:
+        with open(path, 'rb') as f:
+            if size <= 2 * sample_size:
+                data = f.read()
+            else:
+                data = f.read(sample_size)
+                f.seek(size - sample_size)
+                data += f.read(sample_size)
+    except OSError:
+        return None
+    if len(data) != min(size, 2 * sample_size):
+        return None
+    return MD5(backend).hash(data)
+
+
+def full_digest(path, backend=DEFAULT_BACKEND):
+    try:
+        return MD5(backend).hash_file(path)
+    except OSError:
+        return None
+
+
+def _parallel_map(function, arguments, workers):
+    if workers == 1 or len(arguments) < 2:
+        return [function(*args) for args in arguments]
+    chunksize = max(1, len(arguments) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*arguments), chunksize=chunksize))
+
+
+def _regroup(groups, keys):
+    # Splits every group by the matching key, dropping unreadable files (key None) and singletons
+    result = []
+    position = 0
+    for group in groups:
+        split = {}
+        for path in group:
+            key = keys[position]
+            position += 1
+            if key is not None:
+                split.setdefault(key, []).append(path)
+        result.extend(paths for paths in split.values() if len(paths) > 1)
+    return result
+
+
+def _byte_compare(paths):
+    # Partitions paths into sets of byte-identical files
+    classes = []
+    for path in paths:
+        for members in classes:
+            if filecmp.cmp(members[0], path, shallow=False):
+                members.append(path)
+                break
+        else:
+            classes.append([path])
+    return [members for members in classes if len(members) > 1]
+
+
+def find_duplicates(roots, min_size=1, sample_size=SAMPLE_SIZE, workers=None, byte_compare=False,
+                    backend=DEFAULT_BACKEND, progress_callback=None):
+    # Staged search: size -> MD5 of head and tail -> full MD5 (parallel) -> optional byte compare.
+    # Only files that still collide after the cheaper stages are read in full.
+    # progress_callback(stage, candidates) after each stage; returning False cancels (-> None).
+    workers = workers or os.cpu_count() or 1
+    files = scan_files(roots, min_size)
+    sizes = dict(files)
+    report = {'scanned': len(files), 'sampled': 0, 'hashed': 0, 'groups': [], 'reclaimable': 0}
+
+    by_size = {}
+    for path, size in files:
+        by_size.setdefault(size, []).append(path)
+    groups = [paths for paths in by_size.values() if len(paths) > 1]
+    if progress_callback and not progress_callback('size', sum(map(len, groups))):
+        return None
+
+    candidates = [path for group in groups for path in group]
+    report['sampled'] = len(candidates)
+    keys = _parallel_map(sample_digest, [(path, sizes[path], sample_size, backend) for path in candidates], workers)
+    groups = _regroup(groups, keys)
+    digests = dict(zip(candidates, keys))
+    if progress_callback and not progress_callback('sample', sum(map(len, groups))):
+        return None
+
+    # Files no longer than two samples were read whole already, so their sample digest is their full digest
+    large = [group for group in groups if sizes[group[0]] > 2 * sample_size]
+    groups = [group for group in groups if sizes[group[0]] <= 2 * sample_size]
+    candidates = [path for group in large for path in group]
+    report['hashed'] = len(candidates)
+    keys = _parallel_map(full_digest, [(path, backend) for path in candidates], workers)
+    groups += _regroup(large, keys)
+    digests.update(zip(candidates, keys))
+    if progress_callback and not progress_callback('full', sum(map(len, groups))):
+        return None
+
+    if byte_compare:
+        groups = [members for group in groups for members in _byte_compare(group)]
+        if progress_callback and not progress_callback('compare', sum(map(len, groups))):
+            return None
+
+    for paths in groups:
+        size = sizes[paths[0]]
+        report['groups'].append({'size': size, 'digest': digests[paths[0]], 'paths': sorted(paths),
+                                 'reclaimable': size * (len(paths) - 1)})
+    report['groups'].sort(key=lambda group: (-group['reclaimable'], group['paths']))
+    report['reclaimable'] = sum(group['reclaimable'] for group in report['groups'])
+    return report
@@ -0,0 +1,195 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lab2.cache import stat_key
+from lab2.md5 import DEFAULT_BACKEND, MD5
+
+TASK_BYTES = 8 * 1024 * 1024
+TASK_FILES = 256
+
+_GNU_LINE = re.compile(r'^(\\?)([0-9a-fA-F]{32}) [ *](.*)$')
+_BSD_LINE = re.compile(r'^(\\?)MD5 \((.*)\) = ([0-9a-fA-F]{32})$')
+
+
+def iter_files(root, exclude=()):
+    # os.DirEntry of every regular file under root, depth first; symlinks are not followed and unreadable
+    # directories are skipped. entry.stat(follow_symlinks=False) is cached by scandir.
+    exclude = {os.path.abspath(path) for path in exclude}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if exclude and os.path.abspath(entry.path) in exclude:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError:
+            continue
+
+
+def walk_files(root, exclude=()):
+    # Regular files under root as (relative path with '/' separators, size), sorted by path for a stable order
+    files = [(os.path.relpath(entry.path, root).replace(os.sep, '/'), entry.stat(follow_symlinks=False).st_size)
+             for entry in iter_files(root, exclude)]
+    files.sort()
+    return files
+
+
+def pack_tasks(files, task_bytes=TASK_BYTES, task_files=TASK_FILES):
+    # Consecutive files are batched until a task holds ~task_bytes, so tiny files share one round-trip
+    tasks, current, current_bytes = [], [], 0
+    for relative, size in files:
+        if current and (current_bytes + size > task_bytes or len(current) >= task_files):
+            tasks.append(current)
+            current, current_bytes = [], 0
+        current.append(relative)
+        current_bytes += size
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def hash_task(root, paths, backend=DEFAULT_BACKEND):
+    md5 = MD5(backend)
+    results = []
+    for relative in paths:
+        try:
+            results.append((relative, md5.hash_file(os.path.join(root, relative)), None))
+        except OSError as e:
+            results.append((relative, None, str(e)))
+    return results
+
+
+def format_line(digest, path, style='gnu'):
+    # GNU md5sum escapes '\\' and newlines in names and flags such lines with a leading backslash
+    prefix = ''
+    if '\\' in path or '\n' in path:
+        prefix = '\\'
+        path = path.replace('\\', '\\\\').replace('\n', '\\n')
+    if style == 'bsd':
+        return f"{prefix}MD5 ({path}) = {digest}"
+    return f"{prefix}{digest}  {path}"
+
+
+def _unescape(path):
+    return re.sub(r'\\(.)', lambda match: '\n' if match.group(1) == 'n' else match.group(1), path)
+
+
+def parse_manifest(manifest_path):
+    # (path, digest) pairs from a GNU or BSD style md5sum manifest
+    entries = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            gnu = _GNU_LINE.match(line)
+            bsd = _BSD_LINE.match(line)
+            if gnu:
+                escaped, digest, path = gnu.groups()
+            elif bsd:
+                escaped, path, digest = bsd.groups()
+            else:
+                raise ValueError(f"Not an md5sum line: {line!r}")
+            entries.append((_unescape(path) if escaped else path, digest.lower()))
+    return entries
+
+
+def write_manifest(root, output_path, style='gnu', workers=None, backend=DEFAULT_BACKEND, progress_callback=None,
+                   task_bytes=TASK_BYTES):
+    # Hashes every file under root on a process pool and streams md5sum lines in path order.
+    # progress_callback(done_files, total_files) returning False cancels (-> None).
+    files = walk_files(root, exclude=[output_path])
+    tasks = pack_tasks(files, task_bytes)
+    workers = workers or os.cpu_count() or 1
+    summary = {'files': 0, 'bytes': sum(size for _, size in files), 'errors': []}
+
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as out:
+        if workers == 1:
+            results = (hash_task(root, task, backend) for task in tasks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(hash_task, [root] * len(tasks), tasks, [backend] * len(tasks))
+        try:
+            for batch in results:
+                for relative, digest, error in batch:
+                    if digest is None:
+                        summary['errors'].append((relative, error))
+                        continue
+                    out.write(format_line(digest, relative, style) + '\n')
+                    summary['files'] += 1
+                done = summary['files'] + len(summary['errors'])
+                if progress_callback and not progress_callback(done, len(files)):
+                    return None
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+    return summary
+
+
+def _hash_paths(root, files, workers, backend):
+    tasks = pack_tasks(files)
+    if workers == 1:
+        yield from (hash_task(root, task, backend) for task in tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(hash_task, [root] * len(tasks), tasks, [backend] * len(tasks))
+
+
+def verify_manifest(manifest_path, root=None, cache=None, force=False, workers=None, backend=DEFAULT_BACKEND,
+                    progress_callback=None):
+    # Checks every manifest entry under root (default: the manifest's directory). With a HashCache, files whose
+    # stat key is unchanged are trusted and only the suspects are re-hashed, unless force=True.
+    # progress_callback(done, total) returning False cancels (-> None).
+    root = os.path.dirname(os.path.abspath(manifest_path)) if root is None else root
+    entries = parse_manifest(manifest_path)
+    report = {'ok': [], 'mismatched': [], 'missing': [], 'cached': 0, 'hashed': 0}
+    expected, stats, suspects = {}, {}, []
+
+    for relative, digest in entries:
+        try:
+            st = os.stat(os.path.join(root, relative))
+        except OSError:
+            report['missing'].append(relative)
+            continue
+        cached = None if cache is None or force else cache.lookup(st)
+        if cached is not None:
+            report['ok' if cached == digest else 'mismatched'].append(relative)
+            report['cached'] += 1
+        else:
+            expected[relative], stats[relative] = digest, st
+            suspects.append(relative)
+
+    done = len(entries) - len(suspects)
+    if progress_callback and not progress_callback(done, len(entries)):
+        return None
+
+    started = time.time_ns()
+    fresh = []
+    suspects = [(path, stats[path].st_size) for path in suspects]
+    for batch in _hash_paths(root, suspects, workers or os.cpu_count() or 1, backend):
+        for relative, digest, _ in batch:
+            if digest is None:
+                report['missing'].append(relative)
+                continue
+            report['ok' if digest == expected[relative] else 'mismatched'].append(relative)
+            report['hashed'] += 1
+            try:
+                if stat_key(os.stat(os.path.join(root, relative))) == stat_key(stats[relative]):
+                    fresh.append((stats[relative], digest))
+            except OSError:
+                pass
+        done += len(batch)
+        if progress_callback and not progress_callback(done, len(entries)):
+            return None
+
+    if cache is not None:
+        cache.store_many(fresh, started)
+    return report
@@ -1,102 +1,560 @@
+import hashlib
+import io
 import math
+import mmap
 import os
+import queue
+import stat
 import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Shared round tables, computed once at import instead of per instance
+S = [7, 12, 17, 22] * 4 + [5, 9, 14, 20] * 4 + [4, 11, 16, 23] * 4 + [6, 10, 15, 21] * 4
+K = [int(abs(math.sin(i + 1)) * 2 ** 32) & 0xFFFFFFFF for i in range(64)]
+G = [i if i < 16 else (5 * i + 1) % 16 if i < 32 else (3 * i + 5) % 16 if i < 48 else (7 * i) % 16
+     for i in range(64)]
+
+
+def padding(length):
+    # 0x80, zeros up to 56 mod 64, then the bit length as a little-endian 64-bit word
+    return b'\x80' + b'\x00' * ((55 - length) % 64) + struct.pack('<Q', (8 * length) & 0xFFFFFFFFFFFFFFFF)
+
+
+def _to_bytes(message):
+    return message.encode('utf-8') if isinstance(message, str) else bytes(message)
+
+
+def left_rotate(x, c):
+    return ((x << c) | (x >> (32 - c))) & 0xFFFFFFFF
+
+
+def compress_reference(buf, block):
+    a, b, c, d = buf
+
+    for i in range(64):
+        if i < 16:
+            f = (b & c) | ((~b) & d)
+        elif i < 32:
+            f = (d & b) | ((~d) & c)
+        elif i < 48:
+            f = b ^ c ^ d
+        else:
+            f = c ^ (b | (~d))
+
+        temp = d
+        d = c
+        c = b
+        b = (b + left_rotate((a + f + K[i] + block[G[i]]) & 0xFFFFFFFF, S[i])) & 0xFFFFFFFF
+        a = temp
+
+    return [(buf[i] + x) & 0xFFFFFFFF for i, x in enumerate([a, b, c, d])]
+
+
+def compress_unrolled(buf, block):
+    # compress with all 64 rounds written out, constants inlined and block words held in locals
+    a, b, c, d = buf
+    x0, x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14, x15 = block
+
+    t = (a + (d ^ (b & (c ^ d))) + x0 + 0xd76aa478) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x1 + 0xe8c7b756) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x2 + 0x242070db) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x3 + 0xc1bdceee) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x4 + 0xf57c0faf) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x5 + 0x4787c62a) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x6 + 0xa8304613) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x7 + 0xfd469501) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x8 + 0x698098d8) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x9 + 0x8b44f7af) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x10 + 0xffff5bb1) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x11 + 0x895cd7be) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+    t = (a + (d ^ (b & (c ^ d))) + x12 + 0x6b901122) & 0xFFFFFFFF
+    a = (b + ((t << 7) | (t >> 25))) & 0xFFFFFFFF
+    t = (d + (c ^ (a & (b ^ c))) + x13 + 0xfd987193) & 0xFFFFFFFF
+    d = (a + ((t << 12) | (t >> 20))) & 0xFFFFFFFF
+    t = (c + (b ^ (d & (a ^ b))) + x14 + 0xa679438e) & 0xFFFFFFFF
+    c = (d + ((t << 17) | (t >> 15))) & 0xFFFFFFFF
+    t = (b + (a ^ (c & (d ^ a))) + x15 + 0x49b40821) & 0xFFFFFFFF
+    b = (c + ((t << 22) | (t >> 10))) & 0xFFFFFFFF
+
+    t = (a + (c ^ (d & (b ^ c))) + x1 + 0xf61e2562) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x6 + 0xc040b340) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x11 + 0x265e5a51) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x0 + 0xe9b6c7aa) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x5 + 0xd62f105d) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x10 + 0x02441453) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x15 + 0xd8a1e681) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x4 + 0xe7d3fbc8) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x9 + 0x21e1cde6) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x14 + 0xc33707d6) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x3 + 0xf4d50d87) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x8 + 0x455a14ed) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+    t = (a + (c ^ (d & (b ^ c))) + x13 + 0xa9e3e905) & 0xFFFFFFFF
+    a = (b + ((t << 5) | (t >> 27))) & 0xFFFFFFFF
+    t = (d + (b ^ (c & (a ^ b))) + x2 + 0xfcefa3f8) & 0xFFFFFFFF
+    d = (a + ((t << 9) | (t >> 23))) & 0xFFFFFFFF
+    t = (c + (a ^ (b & (d ^ a))) + x7 + 0x676f02d9) & 0xFFFFFFFF
+    c = (d + ((t << 14) | (t >> 18))) & 0xFFFFFFFF
+    t = (b + (d ^ (a & (c ^ d))) + x12 + 0x8d2a4c8a) & 0xFFFFFFFF
+    b = (c + ((t << 20) | (t >> 12))) & 0xFFFFFFFF
+
+    t = (a + (b ^ c ^ d) + x5 + 0xfffa3942) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x8 + 0x8771f681) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x11 + 0x6d9d6122) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x14 + 0xfde5380c) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x1 + 0xa4beea44) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x4 + 0x4bdecfa9) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x7 + 0xf6bb4b60) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x10 + 0xbebfbc70) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x13 + 0x289b7ec6) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x0 + 0xeaa127fa) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x3 + 0xd4ef3085) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x6 + 0x04881d05) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+    t = (a + (b ^ c ^ d) + x9 + 0xd9d4d039) & 0xFFFFFFFF
+    a = (b + ((t << 4) | (t >> 28))) & 0xFFFFFFFF
+    t = (d + (a ^ b ^ c) + x12 + 0xe6db99e5) & 0xFFFFFFFF
+    d = (a + ((t << 11) | (t >> 21))) & 0xFFFFFFFF
+    t = (c + (d ^ a ^ b) + x15 + 0x1fa27cf8) & 0xFFFFFFFF
+    c = (d + ((t << 16) | (t >> 16))) & 0xFFFFFFFF
+    t = (b + (c ^ d ^ a) + x2 + 0xc4ac5665) & 0xFFFFFFFF
+    b = (c + ((t << 23) | (t >> 9))) & 0xFFFFFFFF
+
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x0 + 0xf4292244) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x7 + 0x432aff97) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x14 + 0xab9423a7) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x5 + 0xfc93a039) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x12 + 0x655b59c3) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x3 + 0x8f0ccc92) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x10 + 0xffeff47d) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x1 + 0x85845dd1) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x8 + 0x6fa87e4f) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x15 + 0xfe2ce6e0) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x6 + 0xa3014314) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x13 + 0x4e0811a1) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+    t = (a + (c ^ (b | (~d & 0xFFFFFFFF))) + x4 + 0xf7537e82) & 0xFFFFFFFF
+    a = (b + ((t << 6) | (t >> 26))) & 0xFFFFFFFF
+    t = (d + (b ^ (a | (~c & 0xFFFFFFFF))) + x11 + 0xbd3af235) & 0xFFFFFFFF
+    d = (a + ((t << 10) | (t >> 22))) & 0xFFFFFFFF
+    t = (c + (a ^ (d | (~b & 0xFFFFFFFF))) + x2 + 0x2ad7d2bb) & 0xFFFFFFFF
+    c = (d + ((t << 15) | (t >> 17))) & 0xFFFFFFFF
+    t = (b + (d ^ (c | (~a & 0xFFFFFFFF))) + x9 + 0xeb86d391) & 0xFFFFFFFF
+    b = (c + ((t << 21) | (t >> 11))) & 0xFFFFFFFF
+
+    return [(buf[0] + a) & 0xFFFFFFFF, (buf[1] + b) & 0xFFFFFFFF, (buf[2] + c) & 0xFFFFFFFF, (buf[3] + d) & 0xFFFFFFFF]
+
+
+def _hashlib_md5():
+    try:
+        return hashlib.md5(usedforsecurity=False)
+    except (TypeError, ValueError):
+        return hashlib.md5()
+
+
+# name -> (block compression function, optional hashlib-style factory that hashes whole messages natively)
+BACKENDS = {
+    'reference': (compress_reference, None),
+    'unrolled': (compress_unrolled, None),
+}
+try:
+    _hashlib_md5()
+    BACKENDS['hashlib'] = (compress_unrolled, _hashlib_md5)
+except ValueError:
+    pass
+DEFAULT_BACKEND = 'unrolled'
+
+
+def register_backend(name, compress, factory=None):
+    BACKENDS[name] = (compress, factory)
+
+
+_BLOCK = struct.Struct('<16I')
+LITTLE_ENDIAN = sys.byteorder == 'little'
+IO_SIZE = 1024 * 1024
+CHECKPOINT_INTERVAL = 64 * 1024 * 1024
+PIPELINE_BUFFERS = 3
+
+
+class MD5Hasher:
+    # hashlib-compatible incremental MD5: only a partial (< 64 byte) block is ever buffered
+    name = 'md5'
+    digest_size = 16
+    block_size = 64
+
+    def __init__(self, data=b'', backend=DEFAULT_BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown MD5 backend: {backend}")
+        self.backend = backend
+        self._compress, factory = BACKENDS[backend]
+        self._native = factory() if factory is not None else None
+        self._state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476]
+        self._count = 0
+        self._tail = bytearray()
+        self.update(data)
+
+    def update(self, data):
+        if self._native is not None:
+            self._native.update(data)
+            return
+        view = memoryview(data).cast('B')
+        length = len(view)
+        self._count += length
+        compress, unpack, state = self._compress, _BLOCK.unpack_from, self._state
+
+        offset = 0
+        if self._tail:
+            offset = min(64 - len(self._tail), length)
+            self._tail += view[:offset]
+            if len(self._tail) < 64:
+                return
+            state = compress(state, unpack(self._tail))
+            self._tail.clear()
+
+        end = offset + (length - offset) // 64 * 64
+        if LITTLE_ENDIAN:
+            # Zero-copy: each block is a 16-word slice of the caller's buffer
+            words = view[offset:end].cast('I')
+            for position in range(0, len(words), 16):
+                state = compress(state, words[position:position + 16])
+        else:
+            for position in range(offset, end, 64):
+                state = compress(state, unpack(view, position))
+        self._state = state
+        self._tail += view[end:]
+
+    def export_state(self):
+        # JSON-serialisable midstate: chaining words, bytes consumed so far and the unprocessed partial block
+        if self._native is not None:
+            raise ValueError(f"The {self.backend} backend does not expose its internal state.")
+        return {'state': list(self._state), 'count': self._count, 'tail': self._tail.hex()}
+
+    @classmethod
+    def from_state(cls, saved, backend=DEFAULT_BACKEND):
+        hasher = cls(backend=backend)
+        if hasher._native is not None:
+            raise ValueError(f"The {backend} backend cannot be resumed from a saved state.")
+        state, count, tail = list(saved['state']), saved['count'], bytearray.fromhex(saved['tail'])
+        if len(state) != 4 or not all(0 <= word < 2 ** 32 for word in state) or count < 0 or len(tail) != count % 64:
+            raise ValueError("Invalid MD5 state.")
+        hasher._state, hasher._count, hasher._tail = state, count, tail
+        return hasher
+
+    def copy(self):
+        clone = MD5Hasher.__new__(MD5Hasher)
+        clone.backend = self.backend
+        clone._compress = self._compress
+        clone._native = self._native.copy() if self._native is not None else None
+        clone._state = list(self._state)
+        clone._count = self._count
+        clone._tail = bytearray(self._tail)
+        return clone
+
+    def digest(self):
+        if self._native is not None:
+            return self._native.digest()
+        final = self._tail + padding(self._count)
+        state = self._state
+        for position in range(0, len(final), 64):
+            state = self._compress(state, _BLOCK.unpack_from(final, position))
+        return struct.pack('<4I', *state)
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+class _Checkpoint:
+    def __init__(self, hasher, callback, interval):
+        self.hasher = hasher
+        self.callback = callback
+        self.interval = interval
+        self.last = hasher._count
+        self.saved = False
+
+    def tick(self):
+        if self.callback and self.hasher._count - self.last >= self.interval:
+            self.save()
+
+    def save(self):
+        if self.callback and not (self.saved and self.last == self.hasher._count):
+            self.callback(self.hasher.export_state())
+            self.last, self.saved = self.hasher._count, True
+
+
+class PipelinedReader:
+    # A reader thread fills a ring of preallocated buffers (readinto drops the GIL) while the caller consumes
+    # them. Iterating yields memoryviews that stay valid until the next item is requested.
+    # stats: reader_stall = reader waiting for a free buffer (consumer is the bottleneck),
+    #        consumer_stall = consumer waiting for data (I/O is the bottleneck).
+    def __init__(self, file, buffer_count=PIPELINE_BUFFERS, buffer_size=IO_SIZE):
+        if buffer_count < 2:
+            raise ValueError("A pipeline needs at least two buffers.")
+        self.file = file
+        self.buffers = [bytearray(buffer_size) for _ in range(buffer_count)]
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+        for index in range(buffer_count):
+            self.free.put(index)
+        self.stopped = threading.Event()
+        self.stats = {'bytes': 0, 'reads': 0, 'reader_stall': 0.0, 'consumer_stall': 0.0}
+        self.thread = None
+
+    def _read_loop(self):
+        try:
+            while True:
+                started = time.perf_counter()
+                index = self.free.get()
+                self.stats['reader_stall'] += time.perf_counter() - started
+                if self.stopped.is_set():
+                    return
+                read = self.file.readinto(self.buffers[index])
+                if not read:
+                    self.filled.put((None, None))
+                    return
+                self.stats['bytes'] += read
+                self.stats['reads'] += 1
+                self.filled.put((index, read))
+        except BaseException as e:
+            self.filled.put((None, e))
+
+    def __iter__(self):
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        views = [memoryview(buffer) for buffer in self.buffers]
+        try:
+            while True:
+                started = time.perf_counter()
+                index, read = self.filled.get()
+                self.stats['consumer_stall'] += time.perf_counter() - started
+                if index is None:
+                    if read is not None:
+                        raise read
+                    return
+                try:
+                    yield views[index][:read]
+                finally:
+                    self.free.put(index)
+        finally:
+            self.stopped.set()
+            self.free.put(None)
+            self.thread.join()
+            for view in views:
+                view.release()
 
 
 class MD5:
-    def __init__(self):
-        self.S = [7, 12, 17, 22] * 4 + [5, 9, 14, 20] * 4 + [4, 11, 16, 23] * 4 + [6, 10, 15, 21] * 4
-        self.K = [int(abs(math.sin(i + 1)) * 2 ** 32) & 0xFFFFFFFF for i in range(64)]
+    def __init__(self, backend=DEFAULT_BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown MD5 backend: {backend}")
+        self.backend = backend
+        self._compress, self._factory = BACKENDS[backend]
+        self.S = S
+        self.K = K
         self.A = 0x67452301
         self.B = 0xEFCDAB89
         self.C = 0x98BADCFE
         self.D = 0x10325476
 
     def left_rotate(self, x, c):
-        return ((x << c) | (x >> (32 - c))) & 0xFFFFFFFF
+        return left_rotate(x, c)
 
     def compress(self, buf, block):
-        a, b, c, d = buf
+        return self._compress(buf, block)
+
+    def new(self, data=b''):
+        return MD5Hasher(data, self.backend)
+
+    def hash(self, message):
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        return self.new(message).hexdigest()
+
+    def hash_file(self, file, progress_callback=None, chunk_size=IO_SIZE, use_mmap=False, resume=None,
+                  checkpoint_callback=None, checkpoint_interval=CHECKPOINT_INTERVAL, pipeline_buffers=0, stats=None):
+        # file is a path or a binary file object (pipe, socket.makefile, sys.stdin.buffer, ...).
+        # Regular files can be memory-mapped; everything else streams through one reused readinto buffer.
+        # Progress is 0 until the end when the size is unknown (pipes, /proc files, empty files).
+        # resume is an MD5Hasher.export_state() dict: hashing continues at byte resume['count'], which also extends
+        # the digest of an append-only file. checkpoint_callback(state) gets the midstate every checkpoint_interval
+        # bytes, on cancel and once the whole file has been read.
+        # pipeline_buffers >= 2 overlaps reads with compression through a PipelinedReader of that many chunk_size
+        # buffers; its stall statistics are copied into the `stats` dict when one is given.
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, 'rb', buffering=0 if pipeline_buffers else -1) as f:
+                return self.hash_file(f, progress_callback, chunk_size, use_mmap, resume, checkpoint_callback,
+                                      checkpoint_interval, pipeline_buffers, stats)
+
+        try:
+            info = os.fstat(file.fileno())
+            file_size = info.st_size if stat.S_ISREG(info.st_mode) else 0
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            file_size = 0
+
+        if resume is not None:
+            hasher = MD5Hasher.from_state(resume, self.backend)
+            if file_size and file_size < hasher._count:
+                raise ValueError("File is shorter than the saved state; it was not only appended to.")
+            file.seek(hasher._count)
+        else:
+            hasher = self.new()
+        checkpoint = _Checkpoint(hasher, checkpoint_callback, checkpoint_interval)
+
+        if pipeline_buffers:
+            reader = PipelinedReader(file, pipeline_buffers, chunk_size)
+            chunks = iter(reader)
+            try:
+                finished = self._hash_chunks(hasher, chunks, file_size, progress_callback, checkpoint)
+            finally:
+                chunks.close()
+            if stats is not None:
+                stats.update(reader.stats)
+        elif use_mmap and file_size > 0 and file.tell() == hasher._count:
+            finished = self._hash_mapped(hasher, file, file_size, progress_callback, chunk_size, checkpoint)
+        else:
+            finished = self._hash_stream(hasher, file, file_size, progress_callback, chunk_size, checkpoint)
+        checkpoint.save()
+        if not finished:
+            return None
+
+        if progress_callback:
+            progress_callback(100)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _report(progress_callback, processed_size, file_size):
+        if not progress_callback:
+            return True
+        progress = min(100, (processed_size / file_size) * 100) if file_size else 0
+        return progress_callback(progress)
 
+    def _hash_stream(self, hasher, file, file_size, progress_callback, chunk_size, checkpoint):
+        buffer = bytearray(chunk_size)
+        processed_size = hasher._count
+        with memoryview(buffer) as view:
+            while read := file.readinto(buffer):
+                hasher.update(view[:read])
+                processed_size += read
+                checkpoint.tick()
+                if not self._report(progress_callback, processed_size, file_size):
+                    return False
+        return True
+
+    def _hash_chunks(self, hasher, chunks, file_size, progress_callback, checkpoint):
+        processed_size = hasher._count
+        for chunk in chunks:
+            hasher.update(chunk)
+            processed_size += len(chunk)
+            checkpoint.tick()
+            if not self._report(progress_callback, processed_size, file_size):
+                return False
+        return True
+
+    def _hash_mapped(self, hasher, file, file_size, progress_callback, chunk_size, checkpoint):
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            for start in range(hasher._count, len(view), chunk_size):
+                hasher.update(view[start:start + chunk_size])
+                checkpoint.tick()
+                if not self._report(progress_callback, min(start + chunk_size, len(view)), len(view)):
+                    return False
+        return True
+
+    def compress_lanes(self, buf, blocks):
+        # Same 64 rounds as compress, but every variable is a uint32 vector with one lane per message
+        a, b, c, d = buf
         for i in range(64):
             if i < 16:
-                f = (b & c) | ((~b) & d)
+                f = (b & c) | (~b & d)
                 g = i
             elif i < 32:
-                f = (d & b) | ((~d) & c)
+                f = (d & b) | (~d & c)
                 g = (5 * i + 1) % 16
             elif i < 48:
                 f = b ^ c ^ d
                 g = (3 * i + 5) % 16
             else:
-                f = c ^ (b | (~d))
+                f = c ^ (b | ~d)
                 g = (7 * i) % 16
 
-            temp = d
-            d = c
-            c = b
-            b = (b + self.left_rotate((a + f + self.K[i] + block[g]) & 0xFFFFFFFF, self.S[i])) & 0xFFFFFFFF
-            a = temp
+            x = a + f + np.uint32(self.K[i]) + blocks[:, g]
+            s = np.uint32(self.S[i])
+            a, d, c = d, c, b
+            b = b + ((x << s) | (x >> np.uint32(32 - s)))
 
-        return [(buf[i] + x) & 0xFFFFFFFF for i, x in enumerate([a, b, c, d])]
+        return [buf[0] + a, buf[1] + b, buf[2] + c, buf[3] + d]
 
-    def hash(self, message):
-        message = bytearray(message.encode('utf-8'))
-        orig_len_in_bits = (8 * len(message)) & 0xFFFFFFFFFFFFFFFF
-        message.append(0x80)
-        while len(message) % 64 != 56:
-            message.append(0)
-        message += struct.pack('<Q', orig_len_in_bits)
-
-        buf = [self.A, self.B, self.C, self.D]
-        for offset in range(0, len(message), 64):
-            block = struct.unpack('<16I', message[offset:offset + 64])
-            buf = self.compress(buf, block)
-
-        return ''.join(f'{x:02x}' for x in struct.pack('<4I', *buf))
-
-    def hash_file(self, file_path, progress_callback=None):
-        buf = [self.A, self.B, self.C, self.D]
-        file_size = os.path.getsize(file_path)
-        processed_size = 0
-        chunk_size = 8192
-
-        with open(file_path, 'rb') as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-
-                processed_size += len(chunk)
-                chunk_len = len(chunk)
-
-                for i in range(0, chunk_len, 64):
-                    if i + 64 <= chunk_len:
-                        block = struct.unpack('<16I', chunk[i:i + 64])
-                        buf = self.compress(buf, block)
-                    else:
-                        remaining = chunk[i:]
-                        break
-                else:
-                    remaining = b''
-
-                if progress_callback:
-                    progress = (processed_size / file_size) * 100
-                    if not progress_callback(progress):
-                        return None
-
-            orig_len_in_bits = (8 * processed_size) & 0xFFFFFFFFFFFFFFFF
-            remaining = bytearray(remaining)
-            remaining.append(0x80)
-            while len(remaining) % 64 != 56:
-                remaining.append(0)
-            remaining += struct.pack('<Q', orig_len_in_bits)
-
-            for i in range(0, len(remaining), 64):
-                block = struct.unpack('<16I', remaining[i:i + 64])
-                buf = self.compress(buf, block)
+    def hash_many(self, messages, raw=False):
+        # Pads every message, groups equal block counts and runs compress_lanes over each group at once
+        messages = [_to_bytes(message) for message in messages]
+        if self._factory is not None:
+            digests = []
+            for message in messages:
+                hasher = self._factory()
+                hasher.update(message)
+                digests.append(hasher.digest() if raw else hasher.hexdigest())
+            return digests
 
-        if progress_callback:
-            progress_callback(100)
+        groups = {}
+        for index, message in enumerate(messages):
+            groups.setdefault((len(message) + 8) // 64 + 1, []).append(index)
 
-        return ''.join(f'{x:02x}' for x in struct.pack('<4I', *buf))
+        digests = [None] * len(messages)
+        for block_count, indices in groups.items():
+            padded = b''.join(messages[i] + padding(len(messages[i])) for i in indices)
+            words = np.frombuffer(padded, dtype='<u4').astype(np.uint32).reshape(len(indices), block_count, 16)
+            buf = [np.full(len(indices), value, dtype=np.uint32) for value in (self.A, self.B, self.C, self.D)]
+            for block in range(block_count):
+                buf = self.compress_lanes(buf, words[:, block, :])
+            state = np.stack(buf, axis=1).astype('<u4').tobytes()
+            for lane, i in enumerate(indices):
+                digest = state[16 * lane:16 * lane + 16]
+                digests[i] = digest if raw else digest.hex()
+        return digests
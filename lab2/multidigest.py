@@ -0,0 +1,108 @@
+import hashlib
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from lab2.md5 import DEFAULT_BACKEND, IO_SIZE, MD5Hasher
+
+DEFAULT_ALGORITHMS = ('md5', 'sha256')
+
+
+class CRC32:
+    # hashlib-style wrapper around zlib.crc32; the digest is the big-endian 32-bit value, as cksum tools print it
+    name = 'crc32'
+    digest_size = 4
+
+    def __init__(self, data=b''):
+        self.value = zlib.crc32(data)
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def copy(self):
+        clone = CRC32()
+        clone.value = self.value
+        return clone
+
+    def digest(self):
+        return self.value.to_bytes(4, 'big')
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def make_hasher(name, backend=DEFAULT_BACKEND):
+    # 'md5' is the project's MD5 on the given backend, 'crc32' is zlib, anything else comes from hashlib
+    if name == 'md5':
+        return MD5Hasher(backend=backend)
+    if name == 'crc32':
+        return CRC32()
+    return hashlib.new(name)
+
+
+class MultiDigest:
+    # Feeds every chunk to all hashers. threaded=True gives each hasher its own worker thread: hashlib and zlib
+    # drop the GIL on large buffers, so they run alongside each other and alongside the pure-Python MD5.
+    def __init__(self, algorithms=DEFAULT_ALGORITHMS, threaded=False, backend=DEFAULT_BACKEND):
+        if not algorithms:
+            raise ValueError("At least one algorithm is required.")
+        self.hashers = {name: make_hasher(name, backend) for name in algorithms}
+        self.executor = ThreadPoolExecutor(max_workers=len(self.hashers)) if threaded else None
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def submit(self, data):
+        # Starts hashing data and returns at once when threaded; data must stay unchanged until join()
+        if self.executor is None:
+            for hasher in self.hashers.values():
+                hasher.update(data)
+            return
+        self.join()
+        self.pending = [self.executor.submit(hasher.update, data) for hasher in self.hashers.values()]
+
+    def join(self):
+        done, _ = wait(self.pending)
+        self.pending = []
+        for future in done:
+            future.result()
+
+    def update(self, data):
+        self.submit(data)
+        self.join()
+
+    def hexdigests(self):
+        self.join()
+        return {name: hasher.hexdigest() for name, hasher in self.hashers.items()}
+
+
+def hash_file(path, algorithms=DEFAULT_ALGORITHMS, threaded=False, chunk_size=IO_SIZE, backend=DEFAULT_BACKEND,
+              progress_callback=None):
+    # Every algorithm from a single read of the file: {name: hexdigest}, or None if progress_callback cancels.
+    # Two buffers alternate, so the next chunk is read while the hashers work on the previous one.
+    file_size = os.path.getsize(path)
+    buffers = [bytearray(chunk_size), bytearray(chunk_size)]
+    processed_size = 0
+    with open(path, 'rb', buffering=0) as f, MultiDigest(algorithms, threaded, backend) as digest:
+        turn = 0
+        while read := f.readinto(buffers[turn]):
+            digest.submit(memoryview(buffers[turn])[:read])
+            processed_size += read
+            turn ^= 1
+            progress = min(100, processed_size / file_size * 100) if file_size else 0
+            if progress_callback and not progress_callback(progress):
+                digest.join()
+                return None
+        result = digest.hexdigests()
+    if progress_callback:
+        progress_callback(100)
+    return result
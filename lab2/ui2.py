@@ -1,9 +1,10 @@
+import os
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
 import styles
-from lab2 import utils2
+from lab2 import manifest, utils2
 from lab2.md5 import MD5
 
 
@@ -18,6 +19,7 @@ class UI:
         self.create_widgets()
         self.is_operation_running = False
         self.cancel_operation = False
+        self.checkpoint = None
 
     def create_widgets(self):
         main_container = ttk.Frame(self.master, padding="20 20 20 20")
@@ -63,6 +65,8 @@ class UI:
         self.save_hash_button.pack(side=tk.LEFT, padx=5)
         self.hash_file_button = ttk.Button(button_frame, text="Hash File", command=self.hash_file)
         self.hash_file_button.pack(side=tk.LEFT, padx=5)
+        self.hash_directory_button = ttk.Button(button_frame, text="Hash Directory", command=self.hash_directory)
+        self.hash_directory_button.pack(side=tk.LEFT, padx=5)
         self.check_integrity_button = ttk.Button(button_frame, text="Check File Integrity",
                                                  command=self.check_file_integrity)
         self.check_integrity_button.pack(side=tk.LEFT, padx=5)
@@ -74,7 +78,7 @@ class UI:
 
         self.ui_elements = [
             self.input_field, self.hash_button, self.run_tests_button, self.save_hash_button,
-            self.hash_file_button, self.check_integrity_button, self.close_button
+            self.hash_file_button, self.hash_directory_button, self.check_integrity_button, self.close_button
         ]
 
     def set_ui_state(self, state):
@@ -149,21 +153,47 @@ class UI:
     def hash_file(self):
         file_path = filedialog.askopenfilename()
         if file_path:
+            resume = self._saved_checkpoint(file_path)
             self.clear_fields()
             self.set_ui_state('disabled')
             self.progress_var.set(0)
             self.set_progress_identifier(f"Hashing file: {file_path}")
             self.cancel_operation = False
-            threading.Thread(target=self._hash_file_thread, args=(file_path,), daemon=True).start()
-
-    def _hash_file_thread(self, file_path):
+            threading.Thread(target=self._hash_file_thread, args=(file_path, resume), daemon=True).start()
+
+    def _saved_checkpoint(self, file_path):
+        # Offer to continue a cancelled hash of the same, unmodified file
+        if self.checkpoint is None:
+            return None
+        saved_path, saved_stat, state = self.checkpoint
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if saved_path != file_path or saved_stat != (st.st_size, st.st_mtime_ns) or not st.st_size:
+            return None
+        done = 100 * state['count'] / st.st_size
+        if messagebox.askyesno("Resume", f"Resume the cancelled hash of this file from {done:.1f}%?"):
+            return state
+        return None
+
+    def _hash_file_thread(self, file_path, resume=None):
         def progress_callback(value):
             if self.cancel_operation:
                 return False
             self.master.after(0, self.update_progress, value)
             return True
 
-        hash_result = self.md5.hash_file(file_path, progress_callback=progress_callback)
+        st = os.stat(file_path)
+        checkpoints = []
+        hash_result = self.md5.hash_file(file_path, progress_callback=progress_callback, resume=resume,
+                                         checkpoint_callback=checkpoints.append if self.md5.backend != 'hashlib'
+                                         else None)
+        if hash_result is None:
+            if checkpoints:
+                self.checkpoint = (file_path, (st.st_size, st.st_mtime_ns), checkpoints[-1])
+            return
+        self.checkpoint = None
         if not self.cancel_operation:
             self.master.after(0, self._update_hash_result, hash_result)
 
@@ -176,6 +206,37 @@ class UI:
         self.set_progress_identifier("Hashing completed")
         self.set_ui_state('normal')
 
+    def hash_directory(self):
+        directory = filedialog.askdirectory(title="Select directory to hash")
+        if not directory:
+            return
+
+        manifest_path = filedialog.asksaveasfilename(title="Save manifest as", defaultextension=".md5",
+                                                     filetypes=[("MD5 manifest", "*.md5"), ("Text files", "*.txt")])
+        if not manifest_path:
+            return
+
+        self.clear_fields()
+        self.set_ui_state('disabled')
+        self.progress_var.set(0)
+        self.set_progress_identifier(f"Hashing directory: {directory}")
+        self.cancel_operation = False
+        threading.Thread(target=self._hash_directory_thread, args=(directory, manifest_path), daemon=True).start()
+
+    def _hash_directory_thread(self, directory, manifest_path):
+        def progress_callback(done, total):
+            if self.cancel_operation:
+                return False
+            self.master.after(0, self.update_progress, 100 * done / total if total else 100)
+            return True
+
+        summary = manifest.write_manifest(directory, manifest_path, progress_callback=progress_callback)
+        if summary is not None and not self.cancel_operation:
+            result = f"{summary['files']} files, {summary['bytes']} bytes hashed into {manifest_path}"
+            if summary['errors']:
+                result += f"\n{len(summary['errors'])} unreadable: " + ", ".join(path for path, _ in summary['errors'])
+            self.master.after(0, self._update_hash_result, result)
+
     def check_file_integrity(self):
         file_path = filedialog.askopenfilename(title="Select file to check")
         if not file_path:
@@ -1,4 +1,6 @@
-from lab2.md5 import MD5
+import time
+
+from lab2.md5 import BACKENDS, DEFAULT_BACKEND, MD5
 
 
 def save_to_file(file_path, content):
@@ -6,9 +8,13 @@ def save_to_file(file_path, content):
         f.write(content)
 
 
-def check_file_integrity(file_path, hash_file_path, progress_callback=None):
+def check_file_integrity(file_path, hash_file_path, progress_callback=None, cache=None, force=False):
+    # With a HashCache the file is re-hashed only if its stat key changed since the last check (or force=True)
     md5 = MD5()
-    calculated_hash = md5.hash_file(file_path, progress_callback)
+    if cache is not None:
+        calculated_hash = cache.hash_file(file_path, md5, progress_callback, force)
+    else:
+        calculated_hash = md5.hash_file(file_path, progress_callback)
 
     with open(hash_file_path, 'r') as f:
         expected_hash = f.read().strip()
@@ -16,17 +22,20 @@ def check_file_integrity(file_path, hash_file_path, progress_callback=None):
     return calculated_hash.upper() == expected_hash.upper()
 
 
-def run_md5_tests():
-    md5 = MD5()
-    test_cases = {
-        "": "D41D8CD98F00B204E9800998ECF8427E".lower(),
-        "a": "0CC175B9C0F1B6A831C399E269772661".lower(),
-        "abc": "900150983CD24FB0D6963F7D28E17F72".lower(),
-        "message digest": "F96B697D7CB7938D525A2F31AAF161D0".lower(),
-        "abcdefghijklmnopqrstuvwxyz": "C3FCD3D76192E4007DFB496CCA67E13B".lower(),
-        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789": "D174AB98D277D9F5A5611C2C9F419D9F".lower(),
-        "12345678901234567890123456789012345678901234567890123456789012345678901234567890": "57EDF4A22BE3C955AC49DA2E2107B67A".lower()
-    }
+TEST_VECTORS = {
+    "": "D41D8CD98F00B204E9800998ECF8427E".lower(),
+    "a": "0CC175B9C0F1B6A831C399E269772661".lower(),
+    "abc": "900150983CD24FB0D6963F7D28E17F72".lower(),
+    "message digest": "F96B697D7CB7938D525A2F31AAF161D0".lower(),
+    "abcdefghijklmnopqrstuvwxyz": "C3FCD3D76192E4007DFB496CCA67E13B".lower(),
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789": "D174AB98D277D9F5A5611C2C9F419D9F".lower(),
+    "12345678901234567890123456789012345678901234567890123456789012345678901234567890": "57EDF4A22BE3C955AC49DA2E2107B67A".lower()
+}
+
+
+def run_md5_tests(backend=DEFAULT_BACKEND):
+    md5 = MD5(backend)
+    test_cases = TEST_VECTORS
 
     results = []
     for input_text, expected_hash in test_cases.items():
@@ -35,4 +44,36 @@ def run_md5_tests():
         results.append(
             f"Input: '{input_text}'\nExpected:   {expected_hash}\nCalculated: {calculated_hash}\nCorrect: {is_correct}\n")
 
-    return "\n".join(results)
\ No newline at end of file
+    return "\n".join(results)
+
+
+def verify_backends():
+    # Every registered backend checked against the RFC 1321 vectors, both one-shot and fed to MD5Hasher in
+    # 7-byte pieces, so partial blocks are buffered across update() calls
+    results = {}
+    for name in BACKENDS:
+        md5 = MD5(name)
+        correct = True
+        for text, expected in TEST_VECTORS.items():
+            data = text.encode('utf-8')
+            hasher = md5.new()
+            for i in range(0, len(data), 7):
+                hasher.update(data[i:i + 7])
+            correct = correct and md5.hash(text) == expected and hasher.hexdigest() == expected
+        results[name] = correct
+    return results
+
+
+def fastest_backend(sample_size=64 * 1024, repeats=3):
+    # Fastest backend among those that pass verify_backends, timed on sample_size bytes
+    sample = "x" * sample_size
+    timings = {}
+    for name, correct in verify_backends().items():
+        if not correct:
+            continue
+        md5 = MD5(name)
+        started = time.perf_counter()
+        for _ in range(repeats):
+            md5.hash(sample)
+        timings[name] = time.perf_counter() - started
+    return min(timings, key=timings.get)
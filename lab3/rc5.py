@@ -1,4 +1,5 @@
 from lab1.lcg import LCG
+from lab1.sources import LCGSource
 from lab2.md5 import MD5
 from lab3 import config
 
@@ -83,8 +84,7 @@ def process_file(file_path, password_phrase, output_file, progress_callback, enc
     key = md5.hash(password_phrase).encode('utf-8')[:config.RC5_KEY_LENGTH]
     S = key_expansion(key)
 
-    lcg = LCG()
-    IV = lcg.next().to_bytes(config.RC5_BLOCK_SIZE, 'little')
+    IV = LCGSource(LCG()).random_bytes(config.RC5_BLOCK_SIZE)
 
     processed_size = 0
 
@@ -139,8 +139,7 @@ def process_file_(file_path, password_phrase, output_file, encrypt=True):
     key = md5.hash(password_phrase).encode('utf-8')[:config.RC5_KEY_LENGTH]
     S = key_expansion(key)
 
-    lcg = LCG()
-    IV = lcg.next().to_bytes(config.RC5_BLOCK_SIZE, 'little')
+    IV = LCGSource(LCG()).random_bytes(config.RC5_BLOCK_SIZE)
 
     processed_size = 0
 
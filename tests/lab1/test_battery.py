@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lab1.battery import (BirthdaySpacingsTest, GapTest, RunsTest, SerialTest, chi_square_p_value, compare_generators,
+                          gamma_q, run_battery)
+from lab1.lcg import LCG
+from lab1.utils1 import SYSTEM_HIGH, SYSTEM_LOW
+
+
+def block_source(values):
+    position = 0
+
+    def next_block(k):
+        nonlocal position
+        position += k
+        return values[position - k:position]
+
+    return next_block
+
+
+def test_gamma_q_known_values():
+    # Q(1, x) = exp(-x) and chi-square(2 df) survival at 5.991 is 0.05
+    assert gamma_q(1, 2.0) == pytest.approx(np.exp(-2.0))
+    assert gamma_q(1, 0.5) == pytest.approx(np.exp(-0.5))
+    assert gamma_q(1, 5.991 / 2) == pytest.approx(0.05, abs=1e-4)
+    assert gamma_q(127.5, 293.2478 / 2) == pytest.approx(0.05, abs=1e-3)
+    assert chi_square_p_value([10, 10, 10], [10, 10, 10]) == pytest.approx(1.0)
+
+
+def test_good_generator_passes():
+    values = np.random.default_rng(3).integers(0, 2 ** 32, size=200000, dtype=np.uint64)
+    results = run_battery(block_source(values), len(values), 0, 2 ** 32 - 1, chunk_size=30011)
+    assert all(0.0001 < p <= 1 for p in results.values())
+
+
+def test_constant_sequence_fails():
+    values = np.full(50000, 7, dtype=np.uint32)
+    results = run_battery(block_source(values), len(values), 0, 1023)
+    assert all(p < 1e-6 for p in results.values())
+
+
+def test_too_few_values_give_nan():
+    # 100 values are less than one 512-birthday sample; no values at all leave every test without data
+    values = np.random.default_rng(5).integers(0, 2 ** 32, size=100, dtype=np.uint64)
+    results = run_battery(block_source(values), len(values), 0, 2 ** 32 - 1)
+    assert np.isnan(results["Birthday spacings"])
+    assert all(np.isnan(p) for p in run_battery(block_source(values), 0, 0, 2 ** 32 - 1).values())
+    assert np.isnan(chi_square_p_value([0, 0], [0, 0]))
+    assert np.isnan(chi_square_p_value([3, 1], [4, 0]))
+
+
+@pytest.mark.parametrize("resolution,bits,birthdays", [(2 ** 32, 24, 512), (2 ** 20, 20, 203),
+                                                       (SYSTEM_HIGH - SYSTEM_LOW + 1, 19, 161)])
+def test_birthday_year_follows_input_resolution(resolution, bits, birthdays):
+    test = BirthdaySpacingsTest(resolution=resolution)
+    assert test.days == 2 ** bits and test.birthdays == birthdays
+    assert test.expected_duplicates() == pytest.approx(2, abs=0.25)
+
+
+@pytest.mark.parametrize("high", [2 ** 20 - 1, 3 * 2 ** 18 - 1])
+def test_birthday_spacings_passes_good_generator_over_small_range(high):
+    values = np.random.default_rng(7).integers(0, high + 1, size=2 * 10 ** 6)
+    results = run_battery(block_source(values), len(values), 0, high,
+                          tests={"Birthday spacings": BirthdaySpacingsTest(resolution=high + 1)})
+    assert results["Birthday spacings"] > 0.01
+
+
+def test_compare_generators_system_birthday_spacings():
+    with patch('lab1.lcg.read_config', return_value=(48271, 0, 2 ** 31 - 1, 1)):
+        generator = LCG()
+    results = compare_generators(generator, 2 * 10 ** 6, np.random.default_rng(1))
+    assert results["System"]["Birthday spacings"] > 0.01
+    assert results["LCG"]["Birthday spacings"] > 0.01
+
+
+@pytest.mark.parametrize("test_factory", [lambda: SerialTest(3, 8), RunsTest, GapTest, BirthdaySpacingsTest,
+                                          lambda: BirthdaySpacingsTest(resolution=3 * 2 ** 10)])
+def test_results_independent_of_chunking(test_factory):
+    u = np.random.default_rng(5).random(20000)
+    whole, chunked = test_factory(), test_factory()
+    whole.update(u)
+    for start in range(0, len(u), 777):
+        chunked.update(u[start:start + 777])
+    assert whole.p_value() == pytest.approx(chunked.p_value())
+
+
+def test_compare_generators():
+    with patch('lab1.lcg.read_config', return_value=(2 ** 5, 0, 2 ** 10 - 1, 2)):
+        generator = LCG()
+    results = compare_generators(generator, 10000, np.random.default_rng(0))
+    assert set(results) == {"LCG", "System"}
+    assert results["LCG"].keys() == results["System"].keys()
+    assert generator.current == 2
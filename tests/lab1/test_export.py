@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from lab1.export import export_sequence, format_from_path, open_sequence
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        yield tmpdirname
+
+
+def block_source(values):
+    position = 0
+
+    def next_block(k):
+        nonlocal position
+        position += k
+        return values[position - k:position]
+
+    return next_block
+
+
+@pytest.mark.parametrize("fmt,name", [("raw", "seq.bin"), ("npy", "seq.npy"), ("memmap", "seq.npy")])
+@pytest.mark.parametrize("dtype", [np.uint32, np.uint64])
+def test_binary_export_round_trip(temp_dir, fmt, name, dtype):
+    values = np.arange(1000, dtype=dtype) * 7919
+    path = os.path.join(temp_dir, name)
+    export_sequence(block_source(values), len(values), path, fmt, dtype, chunk_size=64)
+    loaded = open_sequence(path, fmt, dtype)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, values)
+
+
+def test_raw_export_is_little_endian(temp_dir):
+    path = os.path.join(temp_dir, "seq.bin")
+    export_sequence(block_source(np.array([1, 256], dtype=np.uint32)), 2, path)
+    with open(path, 'rb') as f:
+        assert f.read() == b'\x01\x00\x00\x00\x00\x01\x00\x00'
+
+
+def test_text_export_written_in_chunks(temp_dir):
+    path = os.path.join(temp_dir, "seq.txt")
+    export_sequence(block_source(np.arange(10, dtype=np.uint32)), 10, path, 'txt', chunk_size=3)
+    with open(path) as f:
+        assert f.read() == ", ".join(map(str, range(10)))
+    with pytest.raises(ValueError):
+        open_sequence(path)
+
+
+def test_format_validation(temp_dir):
+    assert format_from_path("a.NPY") == 'npy'
+    assert format_from_path("a.dat") == 'raw'
+    with pytest.raises(ValueError):
+        export_sequence(block_source(np.arange(3)), 3, os.path.join(temp_dir, "x"), 'csv')
+    with pytest.raises(ValueError):
+        export_sequence(block_source(np.arange(3)), 3, os.path.join(temp_dir, "x"), 'raw', object)
@@ -1,8 +1,10 @@
+import pickle
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
-from lab1.lcg import LCG
+from lab1.lcg import LCG, mersenne_mulmod, mulmod_uint64
 
 
 @pytest.fixture
@@ -25,6 +27,11 @@ def lcg_instance(mock_config):
         )
         return LCG()
 
+
+def make_lcg(a, c, m, seed):
+    with patch('lab1.lcg.read_config', return_value=(a, c, m, seed)):
+        return LCG()
+
 def test_lcg_initialization(lcg_instance, mock_config):
     assert lcg_instance.a == mock_config['a']
     assert lcg_instance.c == mock_config['c']
@@ -44,4 +51,121 @@ def test_lcg_reset(lcg_instance, mock_config):
 def test_generate_sequence(lcg_instance):
     sequence = lcg_instance.generate_sequence(5)
     assert len(sequence) == 5
-    assert all(isinstance(x, int) for x in sequence)
\ No newline at end of file
+    assert all(isinstance(x, int) for x in sequence)
+
+def test_skip_matches_stepping(lcg_instance):
+    reference = lcg_instance.jump(0)
+    expected = reference.generate_sequence(1000)[-1]
+    assert lcg_instance.skip(1000) == expected
+    assert lcg_instance.next() == reference.next()
+
+
+def test_skip_zero_and_negative(lcg_instance, mock_config):
+    assert lcg_instance.skip(0) == mock_config['seed']
+    with pytest.raises(ValueError):
+        lcg_instance.skip(-1)
+
+
+def test_jump_leaves_original_untouched(lcg_instance, mock_config):
+    ahead = lcg_instance.jump(10 ** 9)
+    assert lcg_instance.current == mock_config['seed']
+    assert ahead.current != lcg_instance.current
+
+
+def test_split_substreams_cover_the_stream(lcg_instance):
+    full = lcg_instance.jump(0).generate_sequence(30)
+    substreams = lcg_instance.split(3, 10)
+    assert sum((s.generate_sequence(10) for s in substreams), []) == full
+
+
+def test_split_defaults_to_even_share_of_period():
+    generator = make_lcg(5, 3, 64, 7)
+    full = generator.jump(0).generate_sequence(64)
+    substreams = generator.split(4)
+    assert [s.current for s in substreams] == [generator.current] + full[15:48:16]
+    assert sorted(sum((s.generate_sequence(16) for s in substreams), [])) == list(range(64))
+    with pytest.raises(ValueError):
+        generator.split(65)
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 70000])
+def test_generate_array_matches_scalar(lcg_instance, n):
+    reference = lcg_instance.jump(0)
+    values = lcg_instance.generate_array(n)
+    assert values.dtype == np.uint32
+    assert values.tolist() == reference.generate_sequence(n)
+    assert lcg_instance.current == reference.current
+
+
+def test_generate_array_small_block_size(lcg_instance):
+    reference = lcg_instance.jump(0)
+    values = lcg_instance.generate_array(100, block_size=8)
+    assert values.tolist() == reference.generate_sequence(100)
+
+
+def test_generate_array_large_modulus():
+    generator = make_lcg(1664525, 1013904223, 2 ** 61 - 1, 12345)
+    reference = generator.jump(0)
+    values = generator.generate_sequence(20, as_array=True)
+    assert values.dtype == np.uint64
+    assert values.tolist() == reference.generate_sequence(20)
+
+
+def test_cycle_analytic_and_brent_agree():
+    generator = make_lcg(1664525, 1013904223, 2 ** 16, 12345)
+    assert generator.cycle() == (0, 2 ** 16)
+    assert generator.cycle(analytic=False) == (0, 2 ** 16)
+
+
+@pytest.mark.parametrize("a,c,m,kind", [
+    (1664525, 1013904223, 2 ** 32, 'pow2'),
+    (6364136223846793005, 1442695040888963407, 2 ** 64, 'pow2'),
+    (2 ** 5, 0, 2 ** 10 - 1, 'mersenne'),
+    (48271, 0, 2 ** 31 - 1, 'mersenne'),
+    (16807, 12345, 2 ** 61 - 1, 'mersenne'),
+    (2 ** 40 + 15, 2 ** 35, 2 ** 47 - 1, 'mersenne'),
+    (3, 7, 2 ** 63 - 1, 'mersenne'),
+    (2862933555777941757, 3037000493, 2 ** 63 - 25, 'general'),
+    (2862933555777941757, 3037000493, 2 ** 62 - 57, 'general'),
+    (25214903917, 11, 2 ** 48 + 5, 'general'),
+    (1103515245, 12345, 10 ** 9 + 7, 'general'),
+    (3, 1, 2 ** 80 - 65, 'general'),
+])
+def test_specialised_kernels_match_reference(a, c, m, kind):
+    generator = make_lcg(a, c, m, 987654321 % m)
+    assert generator.kind == kind
+    reference = [987654321 % m]
+    for _ in range(3000):
+        reference.append((a * reference[-1] + c) % m)
+
+    assert generator.jump(0).generate_sequence(3000) == reference[1:]
+    assert generator.generate_array(3000, block_size=512).tolist() == reference[1:]
+    assert generator.current == reference[-1]
+
+
+@pytest.mark.parametrize("k", [33, 47, 61, 62])
+def test_mersenne_mulmod_edge_values(k):
+    m = 2 ** k - 1
+    A = np.array([0, 1, 2, 2 ** 32 - 1, 2 ** 32, m - 1, m // 3], dtype=np.uint64)
+    for x in (0, 1, 2 ** 32 - 1, 2 ** 32, m - 1):
+        assert mersenne_mulmod(A, x, k).tolist() == [a * x % m for a in A.tolist()]
+
+
+@pytest.mark.parametrize("m", [2 ** 33 + 1, 2 ** 48 + 5, 10 ** 18 + 9, 2 ** 62 - 57])
+def test_mulmod_uint64_edge_values(m):
+    A = np.array([0, 1, 2, m - 1, m - 2, m // 2, 2 ** 32 - 1, 2 ** 32, 2 ** 40 + 3], dtype=np.uint64)
+    A = np.concatenate((A, np.random.default_rng(m % 1000).integers(0, m, 500, dtype=np.uint64)))
+    for x in (0, 1, 2 ** 32 - 1, 2 ** 32, 2 ** 50 - 1, 2 ** 50, m // 3, m - 2, m - 1):
+        x %= m
+        assert mulmod_uint64(A, x, m).tolist() == [a * x % m for a in A.tolist()]
+
+
+def test_kernel_choice_for_wide_general_moduli():
+    assert make_lcg(3, 1, 2 ** 62 - 57, 1)._block is not None
+    assert make_lcg(3, 1, 2 ** 63 - 25, 1)._block is None
+
+
+def test_pickle_round_trip_keeps_kernels(lcg_instance):
+    lcg_instance.generate_array(10)
+    clone = pickle.loads(pickle.dumps(lcg_instance))
+    assert clone.generate_array(100).tolist() == lcg_instance.generate_array(100).tolist()
@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+import pytest
+
+from lab1.lcg import LCG
+from lab1.parallel import count_coprime_pairs, estimate_pi_parallel
+from lab1.utils1 import estimate_pi
+
+
+@pytest.fixture
+def generator():
+    with patch('lab1.lcg.read_config', return_value=(48271, 0, 2 ** 31 - 1, 12345)):
+        return LCG()
+
+
+@pytest.mark.parametrize("n,workers", [(1, 2), (2, 2), (1001, 1), (1001, 3), (20000, 4), (7, 16)])
+def test_parallel_matches_serial(generator, n, workers):
+    expected = estimate_pi(generator.jump(0).generate_sequence(n))
+    reference_state = generator.jump(n).current
+    assert estimate_pi_parallel(generator, n, workers=workers, chunk_size=333) == expected
+    assert generator.current == reference_state
+
+
+def test_count_coprime_pairs_ignores_trailing_value(generator):
+    coprime, pairs = count_coprime_pairs(generator, 11, chunk_size=4)
+    assert pairs == 5
+    assert 0 <= coprime <= pairs
@@ -0,0 +1,69 @@
+import os
+import tempfile
+
+import pytest
+
+from lab1 import profiles
+from lab1.utils1 import read_config
+
+
+@pytest.fixture
+def config_file():
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        yield os.path.join(tmpdirname, "config.txt")
+
+
+def write(path, text, mtime_ns=None):
+    with open(path, "w") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("2**10-1", 1023),
+    ("-(3 + 4) * 2", -14),
+    ("1 << 31 | 5", 2 ** 31 | 5),
+    ("  17 // 5 % 3 ", 0),
+])
+def test_parse_expression(text, expected):
+    assert profiles.parse_expression(text) == expected
+
+
+@pytest.mark.parametrize("text", ["__import__('os')", "1.5", "'a'", "x + 1", "2 ** 10 ** 10", "1 +",
+                                  "((2**4096)**4096)**64", "(2 ** 4096) ** 4096"])
+def test_parse_expression_rejects_unsafe_or_invalid(text):
+    with pytest.raises(ValueError):
+        profiles.parse_expression(text)
+
+
+def test_named_profiles_inherit_defaults():
+    parsed = profiles.parse_profiles("a=5\nc=3 # increment\nm=2**4\nseed=7\n\n[fast]\na=9\nseed=1\n")
+    assert parsed['default'] == {'a': 5, 'c': 3, 'm': 16, 'seed': 7}
+    assert parsed['fast'] == {'a': 9, 'c': 3, 'm': 16, 'seed': 1}
+
+
+def test_parse_profiles_errors():
+    with pytest.raises(ValueError, match="Line 2"):
+        profiles.parse_profiles("a=5\nnonsense\n")
+    with pytest.raises(ValueError, match="missing: seed"):
+        profiles.parse_profiles("a=5\nc=1\nm=8\n")
+
+
+def test_load_profiles_is_cached_until_mtime_changes(config_file):
+    write(config_file, "a=5\nc=3\nm=16\nseed=7\n", mtime_ns=10 ** 18)
+    first = profiles.load_profiles(config_file)
+    assert profiles.load_profiles(config_file) is first
+
+    write(config_file, "a=5\nc=3\nm=32\nseed=7\n", mtime_ns=2 * 10 ** 18)
+    second = profiles.load_profiles(config_file)
+    assert second is not first
+    assert second['default']['m'] == 32
+
+    with pytest.raises(KeyError):
+        profiles.get_profile('missing', config_file)
+
+
+def test_read_config_uses_shipped_profiles():
+    assert read_config() == (2 ** 5, 0, 2 ** 10 - 1, 2)
+    assert read_config('minstd') == (48271, 0, 2 ** 31 - 1, 1)
@@ -0,0 +1,68 @@
+import itertools
+
+import pytest
+
+from lab1.search import (candidate_multipliers, dual_lattice_basis, format_profile, hull_dobell_step, lll_reduce,
+                         search_parameters, shortest_vector_norm2, spectral_test, valid_increments)
+
+
+def brute_force_shortest(a, m, t, bound):
+    best = None
+    for s in itertools.product(range(-bound, bound + 1), repeat=t):
+        if any(s) and sum(x * pow(a, i, m) for i, x in enumerate(s)) % m == 0:
+            length = sum(x * x for x in s)
+            best = length if best is None else min(best, length)
+    return best
+
+
+@pytest.mark.parametrize("a,m,t", [(17, 101, 2), (3, 101, 3), (40, 1021, 3), (57, 257, 4), (8, 255, 2)])
+def test_shortest_vector_matches_brute_force(a, m, t):
+    assert shortest_vector_norm2(dual_lattice_basis(a, m, t)) == brute_force_shortest(a, m, t, 12)
+
+
+def test_lll_preserves_lattice_determinant():
+    basis = dual_lattice_basis(48271, 2 ** 31 - 1, 3)
+    reduced = lll_reduce(basis)
+    det = (reduced[0][0] * (reduced[1][1] * reduced[2][2] - reduced[1][2] * reduced[2][1])
+           - reduced[0][1] * (reduced[1][0] * reduced[2][2] - reduced[1][2] * reduced[2][0])
+           + reduced[0][2] * (reduced[1][0] * reduced[2][1] - reduced[1][1] * reduced[2][0]))
+    assert abs(det) == 2 ** 31 - 1
+
+
+def test_spectral_test_distinguishes_multipliers():
+    # a = 1 puts (1, -1) in the dual lattice: the worst possible 2-D structure
+    bad = spectral_test(1, 2 ** 16)
+    good = spectral_test(48271, 2 ** 31 - 1)
+    assert all(0 < value <= 1 for value in good.values())
+    assert min(bad.values()) < 0.01 < min(good.values())
+
+
+def test_valid_increments():
+    assert valid_increments(5, 16, (0, 1, 2, 3)) == [0, 1, 3]
+    assert valid_increments(3, 16, (0, 1)) == [0]
+    assert valid_increments(3, 7, (0,)) == [0]
+    assert valid_increments(2, 7, (0,)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_parameters_ranks_valid_candidates(workers):
+    results = search_parameters(2 ** 10, multipliers=range(2, 200), increments=(1, 3), workers=workers, top=5)
+    assert len(results) == 5
+    assert [entry['score'] for entry in results] == sorted((entry['score'] for entry in results), reverse=True)
+    assert all(entry['a'] % 4 == 1 for entry in results)
+    assert format_profile(results[0], name="best").startswith(f"[best]\na={results[0]['a']}\n")
+
+
+def test_candidate_multipliers():
+    assert candidate_multipliers(12, 100) == list(range(2, 12))
+    assert hull_dobell_step(2 ** 32) == 4
+    assert hull_dobell_step(3 * 5 * 2 ** 3) == 60
+    sampled = candidate_multipliers(2 ** 64, 50, seed=3, step=4)
+    assert len(sampled) == 50 and all(a % 4 == 1 for a in sampled)
+    assert sampled == candidate_multipliers(2 ** 64, 50, seed=3, step=4)
+
+
+def test_search_parameters_default_sampling_large_modulus():
+    results = search_parameters(2 ** 48, samples=20, workers=1, seed=5, top=3, dimensions=range(2, 5))
+    assert len(results) == 3
+    assert all(entry['c'] == 1 and entry['a'] % 4 == 1 for entry in results)
@@ -0,0 +1,72 @@
+import array
+import random
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from lab1.lcg import LCG
+from lab1.sources import EntropySource, LCGSource, NumpySource, RandomSource, UrandomSource, get_source
+
+
+def make_lcg(a, c, m, seed):
+    with patch('lab1.lcg.read_config', return_value=(a, c, m, seed)):
+        return LCG()
+
+
+def test_lcg_source_packs_low_bytes():
+    generator = make_lcg(1664525, 1013904223, 2 ** 32, 12345)
+    expected = b''.join(v.to_bytes(4, 'little') for v in generator.jump(0).generate_sequence(3))
+    source = LCGSource(generator)
+    assert source.width == 4
+    assert source.random_bytes(10) == expected[:10]
+
+
+def test_lcg_source_small_modulus_and_chunking():
+    generator = make_lcg(2 ** 5, 0, 2 ** 10 - 1, 2)
+    expected = bytes(v & 0xFF for v in generator.jump(0).generate_sequence(1000))
+    assert LCGSource(generator, chunk_size=64).random_bytes(1000) == expected
+
+
+@pytest.mark.parametrize("source", [
+    RandomSource(random.Random(1)),
+    UrandomSource(chunk_size=100),
+    NumpySource(np.random.default_rng(1), chunk_size=100),
+])
+def test_fill_writes_into_caller_buffers(source):
+    buffer = bytearray(1000)
+    assert source.fill(buffer) is buffer
+    assert buffer != bytearray(1000)
+
+    words = array.array('I', [0] * 64)
+    source.fill(words)
+    assert any(words)
+
+    target = np.zeros(16, dtype=np.uint64)
+    source.fill(memoryview(target))
+    assert target.any()
+
+    with pytest.raises(TypeError):
+        source.fill(b'read-only')
+
+
+def test_seeded_sources_are_reproducible():
+    assert RandomSource(random.Random(5)).random_bytes(64) == RandomSource(random.Random(5)).random_bytes(64)
+    assert (NumpySource(np.random.default_rng(5)).random_bytes(64)
+            == NumpySource(np.random.default_rng(5)).random_bytes(64))
+
+
+def test_block_reader_and_registry():
+    next_block = get_source('numpy', np.random.default_rng(2)).block_reader(np.uint32)
+    block = next_block(100)
+    assert block.dtype == np.dtype('<u4') and len(block) == 100
+    with pytest.raises(ValueError):
+        get_source('dice')
+
+
+def test_source_without_fill_cannot_be_created():
+    class Incomplete(EntropySource):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -1,4 +1,12 @@
-from lab1.utils1 import calculate_period, estimate_pi, generate_system_sequence, gcd
+import math
+
+import numpy as np
+import pytest
+
+from lab1.utils1 import (SYSTEM_HIGH, SYSTEM_LOW, affine_power, calculate_period, estimate_pi, estimate_pi_adaptive,
+                         factorize, find_cycle, gcd, generate_system_array, generate_system_sequence,
+                         is_probable_prime, lcg_period, multiplicative_order, satisfies_hull_dobell, stream_statistics,
+                         wilson_interval)
 
 
 def test_calculate_period():
@@ -36,4 +44,135 @@ def test_generate_system_sequence():
     sequence = generate_system_sequence(10)
     assert len(sequence) == 10
     assert all(isinstance(x, int) for x in sequence)
-    assert all(7 ** 3 + 89 <= x <= 2 ** 20 - 1 for x in sequence)
\ No newline at end of file
+    assert all(7 ** 3 + 89 <= x <= 2 ** 20 - 1 for x in sequence)
+
+def test_affine_power():
+    a, c, m, x = 1664525, 1013904223, 2 ** 32, 12345
+    expected = x
+    for _ in range(50):
+        expected = (a * expected + c) % m
+    A, C = affine_power(a, c, m, 50)
+    assert (A * x + C) % m == expected
+    assert affine_power(a, c, m, 0) == (1, 0)
+
+
+def brute_force_cycle(a, c, m, seed):
+    first_seen = {}
+    x, i = seed, 0
+    while x not in first_seen:
+        first_seen[x] = i
+        x, i = (a * x + c) % m, i + 1
+    return first_seen[x], i - first_seen[x]
+
+
+@pytest.mark.parametrize("a,c,m,seed", [
+    (2 ** 5, 0, 2 ** 10 - 1, 2),
+    (5, 3, 16, 7),
+    (6, 1, 36, 5),
+    (4, 3, 24, 1),
+    (12, 5, 360, 17),
+    (3, 0, 1000, 10),
+    (7, 0, 2 ** 12, 3),
+    (1, 4, 30, 2),
+])
+def test_lcg_period_and_find_cycle_match_brute_force(a, c, m, seed):
+    expected = brute_force_cycle(a, c, m, seed)
+    assert lcg_period(a, c, m, seed) == expected
+    assert find_cycle(lambda x: (a * x + c) % m, seed) == expected
+
+
+def test_lcg_period_large_modulus():
+    # Knuth's MMIX multiplier satisfies Hull-Dobell for m = 2^64
+    assert lcg_period(6364136223846793005, 1442695040888963407, 2 ** 64, 1) == (0, 2 ** 64)
+    # 48271 is a primitive root of the Mersenne prime 2^31 - 1
+    assert lcg_period(48271, 0, 2 ** 31 - 1, 1) == (0, 2 ** 31 - 2)
+    mu, lam = lcg_period(25214903917, 11, 2 ** 48 - 59, 42)
+    assert mu == 0 and (2 ** 48 - 59) * (2 ** 48 - 60) % lam == 0
+
+
+def test_factorize_and_primality():
+    assert factorize(2 ** 10 - 1) == {3: 1, 11: 1, 31: 1}
+    assert factorize(600851475143) == {71: 1, 839: 1, 1471: 1, 6857: 1}
+    assert factorize(2 ** 48 - 1) == {3: 2, 5: 1, 7: 1, 13: 1, 17: 1, 97: 1, 241: 1, 257: 1, 673: 1}
+    assert is_probable_prime(2 ** 61 - 1)
+    assert not is_probable_prime(3215031751)
+
+
+def test_hull_dobell_and_multiplicative_order():
+    assert satisfies_hull_dobell(1664525, 1013904223, 2 ** 32)
+    assert not satisfies_hull_dobell(1664525, 0, 2 ** 32)
+    assert not satisfies_hull_dobell(3, 1, 16)
+    assert multiplicative_order(2, 1023) == 10
+    with pytest.raises(ValueError):
+        multiplicative_order(3, 12)
+
+
+def test_generate_system_array():
+    values = generate_system_array(1000, np.random.default_rng(1))
+    assert values.dtype == np.uint32
+    assert values.min() >= SYSTEM_LOW and values.max() <= SYSTEM_HIGH
+    assert np.array_equal(values, generate_system_array(1000, np.random.default_rng(1)))
+
+
+@pytest.mark.parametrize("n,chunk_size", [(1, 4), (2, 4), (5001, 7), (5001, 1024), (100000, 4096)])
+def test_stream_statistics_matches_list_functions(n, chunk_size):
+    values = generate_system_array(n, np.random.default_rng(7))
+    position = 0
+
+    def next_block(k):
+        nonlocal position
+        position += k
+        return values[position - k:position]
+
+    period, pi = stream_statistics(next_block, n, SYSTEM_HIGH + 1, chunk_size=chunk_size)
+    assert period == calculate_period(values.tolist())
+    assert pi == estimate_pi(values.tolist())
+
+
+def test_stream_statistics_without_bitmap():
+    values = np.arange(2, 12, dtype=np.uint64)
+    period, pi = stream_statistics(lambda k: values[:k], 10, value_limit=None)
+    assert period is None
+    assert pi == estimate_pi(values.tolist())
+
+
+def test_stream_statistics_progress_and_cancel():
+    values = generate_system_array(10000, np.random.default_rng(3))
+    updates = []
+
+    def progress_callback(done, period, pi):
+        updates.append((done, period, pi))
+        return True
+
+    result = stream_statistics(lambda k: values[:k], 10000, SYSTEM_HIGH + 1, chunk_size=4000,
+                               progress_callback=progress_callback)
+    assert [done for done, _, _ in updates] == [4000, 8000, 10000]
+    assert updates[-1][1:] == result
+    assert stream_statistics(lambda k: values[:k], 10000, chunk_size=4000,
+                             progress_callback=lambda *args: False) is None
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(50, 100, 1.959964)
+    assert low == pytest.approx(0.4038, abs=1e-4) and high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+
+def test_estimate_pi_adaptive_stops_early():
+    rng = np.random.default_rng(11)
+    loose = estimate_pi_adaptive(lambda k: generate_system_array(k, rng), precision=0.05, batch_size=1000)
+    tight = estimate_pi_adaptive(lambda k: generate_system_array(k, rng), precision=0.005, batch_size=1000)
+    assert loose['converged'] and tight['converged']
+    assert loose['samples'] < tight['samples']
+    for result in (loose, tight):
+        low, high = result['interval']
+        assert low <= result['pi'] <= high
+        assert low < math.pi < high
+        assert result['throughput'] > 0
+
+
+def test_estimate_pi_adaptive_respects_max_samples():
+    values = np.arange(2, 202, dtype=np.uint32)
+    result = estimate_pi_adaptive(lambda k: values[:k], precision=1e-6, batch_size=64, max_samples=200)
+    assert result['samples'] == 200
+    assert not result['converged']
@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+from lab2.async_hash import AsyncMD5, hash_path, hash_stream
+
+
+class ChunkedReader:
+    """Async reader that hands out data in small pieces and records the largest request."""
+
+    def __init__(self, data, piece=1000):
+        self.data = data
+        self.position = 0
+        self.piece = piece
+        self.largest_request = 0
+
+    async def read(self, n):
+        self.largest_request = max(self.largest_request, n)
+        await asyncio.sleep(0)
+        chunk = self.data[self.position:self.position + min(n, self.piece)]
+        self.position += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("size", [0, 1, 64, 4095, 4096, 50000])
+def test_hash_stream_matches_hashlib(size):
+    data = os.urandom(size)
+    reader = ChunkedReader(data)
+    md5 = AsyncMD5(batch_size=4096)
+    assert asyncio.run(md5.hash_stream(reader)) == hashlib.md5(data).hexdigest()
+    assert reader.largest_request <= 4096
+
+
+def test_hash_stream_with_asyncio_stream_reader():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"message ")
+        reader.feed_data(b"digest")
+        reader.feed_eof()
+        return await hash_stream(reader)
+
+    assert asyncio.run(run()) == hashlib.md5(b"message digest").hexdigest()
+
+
+def test_hash_path(tmp_path):
+    data = os.urandom(100000)
+    path = tmp_path / "upload.bin"
+    path.write_bytes(data)
+    progress = []
+
+    async def run():
+        return await hash_path(str(path), lambda hashed: progress.append(hashed) or True)
+
+    assert asyncio.run(run()) == hashlib.md5(data).hexdigest()
+    assert progress[-1] == len(data)
+
+
+def test_progress_callback_cancels():
+    md5 = AsyncMD5(batch_size=1000)
+    assert asyncio.run(md5.hash_stream(ChunkedReader(b"x" * 10000), lambda hashed: hashed < 3000)) is None
+
+
+def test_concurrency_limit():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    class SlowReader(ChunkedReader):
+        async def read(self, n):
+            nonlocal active, peak
+            if self.position == 0:
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            chunk = await super().read(n)
+            if not chunk:
+                with lock:
+                    active -= 1
+            return chunk
+
+    async def run():
+        md5 = AsyncMD5(concurrency=3, batch_size=512)
+        payloads = [os.urandom(2000) for _ in range(10)]
+        digests = await asyncio.gather(*(md5.hash_stream(SlowReader(p, 500)) for p in payloads))
+        return payloads, digests
+
+    payloads, digests = asyncio.run(run())
+    assert digests == [hashlib.md5(p).hexdigest() for p in payloads]
+    assert peak == 3
+
+
+def test_event_loop_stays_responsive():
+    data = os.urandom(1 << 20)
+    ticks = []
+
+    async def ticker(stop):
+        while not stop.is_set():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def run():
+        stop = asyncio.Event()
+        task = asyncio.create_task(ticker(stop))
+        digest = await AsyncMD5(batch_size=64 * 1024).hash_stream(ChunkedReader(data, 64 * 1024))
+        stop.set()
+        await task
+        return digest
+
+    assert asyncio.run(run()) == hashlib.md5(data).hexdigest()
+    assert len(ticks) > 2
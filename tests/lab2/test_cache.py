@@ -0,0 +1,86 @@
+import hashlib
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lab2.cache import RACY_WINDOW_NS, HashCache
+from lab2.md5 import MD5
+from lab2.utils2 import check_file_integrity
+
+
+def age(path, seconds=60):
+    """Backdate a file so its digest is outside the racy window."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with HashCache(str(tmp_path / "cache.sqlite3")) as cache:
+        yield cache
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc" * 1000)
+    age(path)
+    return str(path)
+
+
+def test_hash_file_caches_unchanged_files(cache, data_file):
+    """Test that a second call is answered from the cache without hashing."""
+    expected = hashlib.md5(b"abc" * 1000).hexdigest()
+    assert cache.hash_file(data_file) == expected
+    with patch.object(MD5, "hash_file", side_effect=AssertionError("re-hashed")):
+        assert cache.hash_file(data_file) == expected
+
+
+def test_force_rehashes(cache, data_file):
+    """Test that force=True bypasses the cached digest."""
+    cache.hash_file(data_file)
+    with patch.object(MD5, "hash_file", return_value="f" * 32) as hash_file:
+        assert cache.hash_file(data_file, force=True) == "f" * 32
+    hash_file.assert_called_once()
+
+
+def test_changed_file_is_rehashed(cache, data_file):
+    """Test that a size or mtime change invalidates the cached digest."""
+    cache.hash_file(data_file)
+    with open(data_file, "ab") as f:
+        f.write(b"more")
+    age(data_file, 30)
+    assert cache.hash_file(data_file) == hashlib.md5(b"abc" * 1000 + b"more").hexdigest()
+
+
+def test_recently_modified_files_are_not_cached(cache, tmp_path):
+    """Test that digests of files touched within the racy window are not stored."""
+    path = tmp_path / "fresh.bin"
+    path.write_bytes(b"x")
+    st = os.stat(path)
+    assert not cache.store(st, "0" * 32, st.st_mtime_ns + RACY_WINDOW_NS // 2)
+    assert cache.lookup(st) is None
+    assert cache.store(st, "0" * 32, st.st_mtime_ns + RACY_WINDOW_NS)
+    assert cache.lookup(st) == "0" * 32
+
+
+def test_cache_persists_across_connections(tmp_path, data_file):
+    """Test that digests survive reopening the database."""
+    path = str(tmp_path / "cache.sqlite3")
+    with HashCache(path) as cache:
+        cache.hash_file(data_file)
+    with HashCache(path) as cache:
+        assert cache.lookup(os.stat(data_file)) == hashlib.md5(b"abc" * 1000).hexdigest()
+        cache.clear()
+        assert cache.lookup(os.stat(data_file)) is None
+
+
+def test_check_file_integrity_with_cache(cache, data_file, tmp_path):
+    """Test that check_file_integrity uses the cache when one is given."""
+    hash_path = tmp_path / "data.md5"
+    hash_path.write_text(hashlib.md5(b"abc" * 1000).hexdigest())
+    assert check_file_integrity(data_file, str(hash_path), cache=cache)
+    with patch.object(MD5, "hash_file", side_effect=AssertionError("re-hashed")):
+        assert check_file_integrity(data_file, str(hash_path), cache=cache)
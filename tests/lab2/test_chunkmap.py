@@ -0,0 +1,111 @@
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from lab2 import chunkmap
+from lab2.chunkmap import (build_chunk_map, chunk_ranges, read_chunk_map, root_digest, verify_chunk_map,
+                           write_chunk_map)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    data = os.urandom(10 * 1000 + 300)
+    path = tmp_path / "disk.img"
+    path.write_bytes(data)
+    return str(path), data
+
+
+def corrupt(path, offset, length=1):
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        original = f.read(length)
+        f.seek(offset)
+        f.write(bytes(b ^ 0xFF for b in original))
+
+
+def test_chunk_ranges():
+    assert chunk_ranges(0, 4) == []
+    assert chunk_ranges(10, 4) == [(0, 4), (4, 4), (8, 2)]
+    assert chunk_ranges(8, 4) == [(0, 4), (4, 4)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_chunk_map_matches_hashlib(data_file, workers):
+    path, data = data_file
+    chunk_map = build_chunk_map(path, chunk_size=1000, workers=workers)
+    expected = [hashlib.md5(data[i:i + 1000]).hexdigest() for i in range(0, len(data), 1000)]
+    assert chunk_map["digests"] == expected and chunk_map["size"] == len(data)
+    assert chunk_map["root"] == hashlib.md5(b"".join(bytes.fromhex(d) for d in expected)).hexdigest()
+
+
+def test_sidecar_round_trip(data_file):
+    path, _ = data_file
+    written = write_chunk_map(path, chunk_size=1000, workers=1)
+    assert os.path.exists(path + ".md5chunks")
+    assert read_chunk_map(path + ".md5chunks") == written
+
+
+def test_damaged_sidecar_rejected(data_file):
+    path, _ = data_file
+    write_chunk_map(path, chunk_size=1000, workers=1)
+    with open(path + ".md5chunks") as f:
+        lines = f.readlines()
+    lines[3] = "0" * 32 + "\n"
+    with open(path + ".md5chunks", "w") as f:
+        f.writelines(lines)
+    with pytest.raises(ValueError, match="damaged"):
+        read_chunk_map(path + ".md5chunks")
+    with open(path + ".md5chunks", "w") as f:
+        f.write("garbage\n")
+    with pytest.raises(ValueError, match="Not a chunk map"):
+        read_chunk_map(path + ".md5chunks")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_reports_corrupted_ranges(data_file, workers):
+    path, _ = data_file
+    write_chunk_map(path, chunk_size=1000, workers=1)
+    assert verify_chunk_map(path, workers=workers)["ok"]
+
+    corrupt(path, 2500)
+    corrupt(path, 3999, 2)
+    corrupt(path, 10100)
+    report = verify_chunk_map(path, workers=workers)
+    assert not report["ok"]
+    assert report["corrupted"] == [(2000, 5000), (10000, 10300)]
+
+
+def test_verify_range_reads_only_overlapping_chunks(data_file):
+    path, _ = data_file
+    write_chunk_map(path, chunk_size=1000, workers=1)
+    corrupt(path, 500)
+    with patch.object(chunkmap, "hash_ranges", wraps=chunkmap.hash_ranges) as hashed:
+        report = verify_chunk_map(path, start=4200, end=6001, workers=1)
+    assert report["ok"] and report["chunks"] == 3
+    assert [r for call in hashed.call_args_list for r in call.args[1]] == [(4000, 1000), (5000, 1000), (6000, 1000)]
+    assert verify_chunk_map(path, start=0, end=1000, workers=1)["corrupted"] == [(0, 1000)]
+
+
+def test_verify_detects_size_changes(data_file):
+    path, data = data_file
+    write_chunk_map(path, chunk_size=1000, workers=1)
+    with open(path, "ab") as f:
+        f.write(b"tail")
+    assert verify_chunk_map(path, workers=1)["corrupted"] == [(10300, 10304)]
+
+    with open(path, "wb") as f:
+        f.write(data[:9500])
+    assert verify_chunk_map(path, workers=1)["corrupted"] == [(9000, 10300)]
+
+
+def test_empty_file_and_cancel(tmp_path, data_file):
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    chunk_map = write_chunk_map(str(empty), workers=1)
+    assert chunk_map["digests"] == [] and chunk_map["root"] == root_digest([])
+    assert verify_chunk_map(str(empty))["ok"]
+
+    path, _ = data_file
+    assert build_chunk_map(path, chunk_size=1000, workers=1, progress_callback=lambda done, total: False) is None
@@ -0,0 +1,108 @@
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from lab2 import duplicates
+from lab2.duplicates import find_duplicates, sample_digest, scan_files
+
+
+def write(root, relative, data):
+    path = os.path.join(root, *relative.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def volume(tmp_path):
+    root = str(tmp_path)
+    big = os.urandom(100000)
+    same_ends = bytearray(big)
+    same_ends[50000] ^= 0xFF
+    paths = {
+        "big1": write(root, "a/big1.bin", big),
+        "big2": write(root, "b/c/big2.bin", big),
+        "big_diff_middle": write(root, "b/big3.bin", bytes(same_ends)),
+        "small1": write(root, "s1.txt", b"hello"),
+        "small2": write(root, "a/s2.txt", b"hello"),
+        "same_size": write(root, "s3.txt", b"world"),
+        "unique": write(root, "u.bin", b"only one of these"),
+        "empty1": write(root, "e1", b""),
+        "empty2": write(root, "e2", b""),
+    }
+    return root, paths, big
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_find_duplicates(volume, workers):
+    root, paths, big = volume
+    report = find_duplicates([root], sample_size=1024, workers=workers)
+
+    assert [group["paths"] for group in report["groups"]] == [
+        sorted([paths["big1"], paths["big2"]]),
+        sorted([paths["small1"], paths["small2"]]),
+    ]
+    assert report["groups"][0]["digest"] == hashlib.md5(big).hexdigest()
+    assert report["groups"][1]["digest"] == hashlib.md5(b"hello").hexdigest()
+    assert report["reclaimable"] == len(big) + 5
+    # Empty files are skipped, the unique-size file is never opened, and only the three large
+    # same-size files are read in full
+    assert report["scanned"] == 7 and report["sampled"] == 6 and report["hashed"] == 3
+
+
+def test_find_duplicates_stages_skip_full_reads(volume):
+    root, paths, _ = volume
+    write(root, "z/other_big.bin", os.urandom(100000))
+    with patch.object(duplicates, "full_digest", wraps=duplicates.full_digest) as full:
+        find_duplicates([root], sample_size=1024, workers=1)
+    assert sorted(call.args[0] for call in full.call_args_list) == sorted(
+        [paths["big1"], paths["big2"], paths["big_diff_middle"]])
+
+
+def test_hard_links_are_not_duplicates(volume):
+    root, paths, _ = volume
+    os.link(paths["unique"], os.path.join(root, "unique_link.bin"))
+    files = scan_files([root])
+    assert len([path for path, _ in files if "unique" in path]) == 1
+    report = find_duplicates([root], sample_size=1024, workers=1)
+    assert all("unique" not in path for group in report["groups"] for path in group["paths"])
+
+
+def test_byte_compare_splits_md5_collisions(volume):
+    root, paths, _ = volume
+    with patch.object(duplicates, "sample_digest", return_value="0" * 32):
+        report = find_duplicates([root], sample_size=1024, workers=1, byte_compare=True)
+    assert sorted(group["paths"] for group in report["groups"]) == sorted([
+        sorted([paths["big1"], paths["big2"]]),
+        sorted([paths["small1"], paths["small2"]]),
+    ])
+
+
+def test_min_size_and_multiple_roots(volume, tmp_path_factory):
+    root, paths, _ = volume
+    other = str(tmp_path_factory.mktemp("other"))
+    copy = write(other, "copy.txt", b"only one of these")
+    report = find_duplicates([root, other], min_size=0, sample_size=1024, workers=1)
+    groups = [group["paths"] for group in report["groups"]]
+    assert sorted([paths["unique"], copy]) in groups
+    assert sorted([paths["empty1"], paths["empty2"]]) in groups
+
+
+def test_sample_digest_reads_head_and_tail(tmp_path):
+    data = b"a" * 100 + b"b" * 1000 + b"c" * 100
+    path = write(str(tmp_path), "f", data)
+    assert sample_digest(path, len(data), 100) == hashlib.md5(b"a" * 100 + b"c" * 100).hexdigest()
+    assert sample_digest(path, len(data), 1000) == hashlib.md5(data).hexdigest()
+    assert sample_digest(os.path.join(str(tmp_path), "missing"), 1) is None
+
+
+def test_progress_and_cancel(volume):
+    root, _, _ = volume
+    stages = []
+    find_duplicates([root], sample_size=1024, workers=1,
+                    progress_callback=lambda stage, n: stages.append(stage) or True)
+    assert stages == ["size", "sample", "full"]
+    assert find_duplicates([root], workers=1, progress_callback=lambda stage, n: stage != "sample") is None
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import tempfile
+import time
+
+import pytest
+
+from lab2.cache import HashCache
+from lab2.manifest import (format_line, iter_files, pack_tasks, parse_manifest, verify_manifest, walk_files,
+                           write_manifest)
+
+
+@pytest.fixture
+def tree():
+    """Create a small directory tree with nested and empty files."""
+    with tempfile.TemporaryDirectory() as root:
+        files = {
+            "a.txt": b"abc",
+            "b/empty.bin": b"",
+            "b/c/data.bin": bytes(range(256)) * 300,
+            "z.txt": b"message digest",
+        }
+        for relative, content in files.items():
+            path = os.path.join(root, *relative.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+        yield root, files
+
+
+def test_walk_files_sorted_relative_paths(tree):
+    """Test that the walk returns every regular file in path order with its size."""
+    root, files = tree
+    assert walk_files(root) == sorted((path, len(content)) for path, content in files.items())
+
+
+def test_iter_files_yields_regular_file_entries(tree):
+    """Test that the shared walker yields DirEntry objects for regular files and skips symlinks and excludes."""
+    root, files = tree
+    os.symlink(os.path.join(root, "a.txt"), os.path.join(root, "link.txt"))
+    os.symlink(os.path.join(root, "b"), os.path.join(root, "link_dir"))
+    entries = list(iter_files(root, exclude=[os.path.join(root, "z.txt")]))
+    assert all(isinstance(entry, os.DirEntry) for entry in entries)
+    assert sorted(os.path.relpath(entry.path, root).replace(os.sep, "/") for entry in entries) == sorted(
+        path for path in files if path != "z.txt")
+
+
+def test_pack_tasks_groups_small_files():
+    """Test that small files share tasks and large files start a new one, keeping order."""
+    files = [("a", 10), ("b", 10), ("c", 100), ("d", 5)]
+    assert pack_tasks(files, task_bytes=50) == [["a", "b"], ["c"], ["d"]]
+    assert pack_tasks(files, task_bytes=1000, task_files=3) == [["a", "b", "c"], ["d"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("style", ["gnu", "bsd"])
+def test_write_manifest_matches_hashlib(tree, workers, style):
+    """Test that the manifest lists hashlib-equal digests in stable order in both formats."""
+    root, files = tree
+    output = os.path.join(root, "manifest.md5")
+    summary = write_manifest(root, output, style=style, workers=workers, task_bytes=64)
+
+    assert summary == {"files": 4, "bytes": sum(map(len, files.values())), "errors": []}
+    expected = [(path, hashlib.md5(files[path]).hexdigest()) for path in sorted(files)]
+    assert parse_manifest(output) == expected
+
+    with open(output) as f:
+        first = f.readline().rstrip("\n")
+    if style == "gnu":
+        assert first == f"{expected[0][1]}  a.txt"
+    else:
+        assert first == f"MD5 (a.txt) = {expected[0][1]}"
+
+
+def test_write_manifest_progress_and_cancel(tree):
+    """Test that progress is streamed per task and returning False cancels."""
+    root, _ = tree
+    output = os.path.join(root, "manifest.md5")
+    calls = []
+
+    def progress(done, total):
+        calls.append((done, total))
+        return True
+
+    write_manifest(root, output, workers=1, task_bytes=1, progress_callback=progress)
+    assert calls == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert write_manifest(root, output, workers=1, task_bytes=1, progress_callback=lambda d, t: False) is None
+
+
+def test_escaped_names_round_trip(tmp_path):
+    """Test md5sum-style escaping of backslashes and newlines in file names."""
+    line = format_line("0" * 32, "odd\\name\nx")
+    assert line == "\\" + "0" * 32 + "  odd\\\\name\\nx"
+    manifest = tmp_path / "m.md5"
+    manifest.write_text(line + "\n" + format_line("f" * 32, "p\\q", "bsd") + "\n")
+    assert parse_manifest(manifest) == [("odd\\name\nx", "0" * 32), ("p\\q", "f" * 32)]
+
+
+def test_parse_manifest_rejects_garbage(tmp_path):
+    """Test that non-md5sum lines raise ValueError."""
+    manifest = tmp_path / "m.md5"
+    manifest.write_text("not a manifest\n")
+    with pytest.raises(ValueError):
+        parse_manifest(manifest)
+
+
+def test_verify_manifest_with_cache(tree, tmp_path):
+    """Test that verification re-hashes only suspects once the cache is warm, and detects changes."""
+    root, files = tree
+    output = os.path.join(root, "manifest.md5")
+    write_manifest(root, output, workers=1)
+    past = time.time() - 60
+    for relative in files:
+        os.utime(os.path.join(root, *relative.split("/")), (past, past))
+
+    with HashCache(str(tmp_path / "cache.sqlite3")) as cache:
+        first = verify_manifest(output, cache=cache, workers=1)
+        assert sorted(first["ok"]) == sorted(files) and first["hashed"] == 4 and first["cached"] == 0
+
+        second = verify_manifest(output, cache=cache, workers=2)
+        assert len(second["ok"]) == 4 and second["hashed"] == 0 and second["cached"] == 4
+
+        forced = verify_manifest(output, cache=cache, force=True, workers=1)
+        assert forced["hashed"] == 4 and forced["cached"] == 0
+
+        with open(os.path.join(root, "a.txt"), "wb") as f:
+            f.write(b"abd")
+        os.remove(os.path.join(root, "z.txt"))
+        report = verify_manifest(output, cache=cache, workers=1)
+        assert report["mismatched"] == ["a.txt"] and report["missing"] == ["z.txt"]
+        assert report["hashed"] == 1 and report["cached"] == 2
+
+
+def test_verify_manifest_without_cache(tree):
+    """Test that verification without a cache hashes everything and supports cancellation."""
+    root, files = tree
+    output = os.path.join(root, "manifest.md5")
+    write_manifest(root, output, style="bsd", workers=1)
+    report = verify_manifest(output, workers=1)
+    assert len(report["ok"]) == 4 and report["hashed"] == 4
+    assert verify_manifest(output, workers=1, progress_callback=lambda d, t: False) is None
@@ -1,9 +1,15 @@
+import array
+import hashlib
+import io
+import json
 import os
 import tempfile
 
+import numpy as np
 import pytest
 
-from lab2.md5 import MD5
+from lab2.md5 import (BACKENDS, MD5, MD5Hasher, PipelinedReader, compress_reference, compress_unrolled, padding,
+                      register_backend)
 
 
 @pytest.fixture
@@ -114,4 +120,270 @@ def test_large_file_hashing(md5_hasher):
         assert len(hash_result) == 32
         assert all(c in "0123456789abcdef" for c in hash_result)
     finally:
-        os.unlink(temp_path)
\ No newline at end of file
+        os.unlink(temp_path)
+
+def test_padding_lengths():
+    for length in (0, 1, 55, 56, 63, 64, 119, 120):
+        assert (length + len(padding(length))) % 64 == 0
+        assert padding(length)[0] == 0x80
+
+
+def test_hash_many_matches_hashlib(md5_hasher):
+    messages = ["", "a", "abc", "x" * 55, "y" * 56, "z" * 64, "q" * 200, "Hello 世界", b"\x00\xff" * 40,
+                bytearray(b"bytes"), memoryview(b"view")]
+    expected = [hashlib.md5(m.encode('utf-8') if isinstance(m, str) else bytes(m)).hexdigest() for m in messages]
+    assert md5_hasher.hash_many(messages) == expected
+    assert md5_hasher.hash_many(messages, raw=True) == [bytes.fromhex(h) for h in expected]
+
+
+def test_hash_many_preserves_order_across_groups(md5_hasher):
+    messages = [f"id-{i}" * (i % 30) for i in range(500)]
+    assert md5_hasher.hash_many(messages) == [md5_hasher.hash(m) for m in messages]
+    assert md5_hasher.hash_many([]) == []
+
+
+def test_tables_are_shared_between_instances():
+    assert MD5().K is MD5().K
+    assert MD5().S is MD5().S
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backends_agree(backend):
+    md5 = MD5(backend)
+    assert md5.backend == backend
+    for message in ("", "abc", "x" * 1000, "Hello 世界"):
+        assert md5.hash(message) == hashlib.md5(message.encode('utf-8')).hexdigest()
+
+
+def test_unrolled_compress_matches_reference():
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476]
+    for block in ([0] * 16, [0xFFFFFFFF] * 16, list(range(16)), [0x9E3779B9 * i & 0xFFFFFFFF for i in range(16)]):
+        assert compress_unrolled(state, block) == compress_reference(state, block)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        MD5("does-not-exist")
+
+
+def test_register_backend():
+    register_backend("custom", compress_reference)
+    try:
+        assert MD5("custom").hash("abc") == "900150983cd24fb0d6963f7d28e17f72"
+    finally:
+        del BACKENDS["custom"]
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_hasher_incremental_updates(backend):
+    data = bytes(range(256)) * 20
+    for split in (1, 7, 63, 64, 65, 1000):
+        hasher = MD5Hasher(backend=backend)
+        for start in range(0, len(data), split):
+            hasher.update(memoryview(data)[start:start + split])
+        assert hasher.hexdigest() == hashlib.md5(data).hexdigest()
+        assert hasher.digest() == hashlib.md5(data).digest()
+
+
+def test_hasher_copy_is_independent():
+    hasher = MD5Hasher(b"prefix-")
+    clone = hasher.copy()
+    hasher.update(b"one")
+    clone.update(b"two")
+    assert hasher.hexdigest() == hashlib.md5(b"prefix-one").hexdigest()
+    assert clone.hexdigest() == hashlib.md5(b"prefix-two").hexdigest()
+    assert hasher.hexdigest() == hashlib.md5(b"prefix-one").hexdigest()  # digest() does not finalise the state
+
+
+def test_hasher_accepts_any_buffer(md5_hasher):
+    words = array.array('I', range(100))
+    assert md5_hasher.new(words).hexdigest() == hashlib.md5(words.tobytes()).hexdigest()
+    assert md5_hasher.hash(b"abc") == md5_hasher.hash("abc")
+    with pytest.raises(TypeError):
+        MD5Hasher().update("text")
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_hasher_constructor_accepts_buffers(backend):
+    words = np.arange(100, dtype=np.uint32)
+    assert MD5Hasher(words, backend).hexdigest() == hashlib.md5(words.tobytes()).hexdigest()
+    assert MD5(backend).new(words).hexdigest() == hashlib.md5(words.tobytes()).hexdigest()
+    array_words = array.array('I', range(100))
+    assert MD5Hasher(array_words, backend).hexdigest() == hashlib.md5(array_words.tobytes()).hexdigest()
+    assert MD5Hasher(np.empty(0, dtype=np.uint8), backend).hexdigest() == hashlib.md5(b"").hexdigest()
+
+
+def test_hash_file_object_without_size(md5_hasher):
+    data = b"streamed " * 5000
+    progress_values = []
+
+    def progress_callback(progress):
+        progress_values.append(progress)
+        return True
+
+    assert md5_hasher.hash_file(io.BytesIO(data), progress_callback, chunk_size=4096) == hashlib.md5(data).hexdigest()
+    assert progress_values[-1] == 100
+
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, 'wb') as writer:
+        writer.write(b"through a pipe")
+    with os.fdopen(read_fd, 'rb') as reader:
+        assert md5_hasher.hash_file(reader) == hashlib.md5(b"through a pipe").hexdigest()
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+@pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 100000])
+def test_hash_file_engines(md5_hasher, use_mmap, size):
+    data = os.urandom(size)
+    progress_values = []
+
+    def progress_callback(progress):
+        progress_values.append(progress)
+        return True
+
+    with tempfile.NamedTemporaryFile(delete=False) as tf:
+        tf.write(data)
+        temp_path = tf.name
+    try:
+        result = md5_hasher.hash_file(temp_path, progress_callback, chunk_size=4096, use_mmap=use_mmap)
+        assert result == hashlib.md5(data).hexdigest()
+        assert progress_values[-1] == 100
+        assert progress_values == sorted(progress_values)
+    finally:
+        os.unlink(temp_path)
+
+
+def test_hash_file_mmap_cancelled(md5_hasher):
+    with tempfile.NamedTemporaryFile(delete=False) as tf:
+        tf.write(b"x" * 10000)
+        temp_path = tf.name
+    try:
+        assert md5_hasher.hash_file(temp_path, lambda progress: False, chunk_size=1024, use_mmap=True) is None
+    finally:
+        os.unlink(temp_path)
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/null"), reason="needs /dev/null")
+def test_hash_special_file(md5_hasher):
+    assert md5_hasher.hash_file("/dev/null", lambda progress: True, use_mmap=True) == hashlib.md5(b"").hexdigest()
+
+
+def test_hasher_state_round_trip():
+    data = os.urandom(1000)
+    hasher = MD5Hasher(data[:333])
+    state = json.loads(json.dumps(hasher.export_state()))
+    resumed = MD5Hasher.from_state(state)
+    resumed.update(data[333:])
+    assert resumed.hexdigest() == hashlib.md5(data).hexdigest()
+
+
+def test_hasher_state_validation():
+    state = MD5Hasher(b"abc").export_state()
+    with pytest.raises(ValueError):
+        MD5Hasher.from_state(dict(state, count=4))
+    with pytest.raises(ValueError):
+        MD5Hasher.from_state(dict(state, state=[0, 0, 0]))
+    if 'hashlib' in BACKENDS:
+        with pytest.raises(ValueError):
+            MD5Hasher(backend='hashlib').export_state()
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_hash_file_resume_after_cancel(md5_hasher, tmp_path, use_mmap):
+    data = os.urandom(50000)
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+    checkpoints = []
+
+    def cancel_halfway(progress):
+        return progress < 50
+
+    assert md5_hasher.hash_file(str(path), cancel_halfway, chunk_size=1000, use_mmap=use_mmap,
+                                checkpoint_callback=checkpoints.append, checkpoint_interval=5000) is None
+    assert [state['count'] for state in checkpoints] == [5000, 10000, 15000, 20000, 25000]
+
+    progress_values = []
+
+    def progress_callback(progress):
+        progress_values.append(progress)
+        return True
+
+    result = md5_hasher.hash_file(str(path), progress_callback, chunk_size=1000, use_mmap=use_mmap,
+                                  resume=checkpoints[-1])
+    assert result == hashlib.md5(data).hexdigest()
+    assert progress_values[0] > 50 and progress_values[-1] == 100
+
+
+def test_hash_file_extends_append_only_file(md5_hasher, tmp_path):
+    path = tmp_path / "growing.log"
+    path.write_bytes(b"first line\n" * 100)
+    saved = []
+    md5_hasher.hash_file(str(path), checkpoint_callback=saved.append)
+    assert saved[-1]['count'] == 1100
+
+    with open(path, 'ab') as f:
+        f.write(b"appended\n" * 7)
+    reads = []
+
+    class CountingReader(io.FileIO):
+        def readinto(self, buffer):
+            read = super().readinto(buffer)
+            reads.append(read)
+            return read
+
+    with CountingReader(str(path)) as f:
+        result = md5_hasher.hash_file(f, resume=saved[-1], checkpoint_callback=saved.append)
+    assert result == hashlib.md5(path.read_bytes()).hexdigest()
+    assert sum(reads) == 63 and saved[-1]['count'] == 1163
+
+    path.write_bytes(b"truncated")
+    with pytest.raises(ValueError):
+        md5_hasher.hash_file(str(path), resume=saved[-1])
+
+
+@pytest.mark.parametrize("size", [0, 1, 4095, 4096, 100000])
+@pytest.mark.parametrize("buffers", [2, 4])
+def test_hash_file_pipelined(md5_hasher, tmp_path, size, buffers):
+    data = os.urandom(size)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    stats = {}
+    result = md5_hasher.hash_file(str(path), chunk_size=4096, pipeline_buffers=buffers, stats=stats)
+    assert result == hashlib.md5(data).hexdigest()
+    assert stats['bytes'] == size and stats['reads'] == -(-size // 4096)
+    assert stats['reader_stall'] >= 0 and stats['consumer_stall'] >= 0
+
+
+def test_hash_file_pipelined_cancel_and_resume(md5_hasher, tmp_path):
+    data = os.urandom(50000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    checkpoints = []
+    assert md5_hasher.hash_file(str(path), lambda progress: progress < 40, chunk_size=1000, pipeline_buffers=3,
+                                checkpoint_callback=checkpoints.append, checkpoint_interval=1000) is None
+    assert checkpoints[-1]['count'] == 20000
+    result = md5_hasher.hash_file(str(path), chunk_size=1000, pipeline_buffers=3, resume=checkpoints[-1])
+    assert result == hashlib.md5(data).hexdigest()
+
+
+def test_pipelined_reader_propagates_errors():
+    class FailingReader(io.RawIOBase):
+        def readinto(self, buffer):
+            raise OSError("device gone")
+
+    with pytest.raises(OSError, match="device gone"):
+        list(PipelinedReader(FailingReader(), 2, 16))
+    with pytest.raises(ValueError):
+        PipelinedReader(io.BytesIO(), 1)
+
+
+def test_pipelined_reader_reuses_buffers():
+    data = bytes(range(256)) * 40
+    reader = PipelinedReader(io.BytesIO(data), 2, 100)
+    chunks = [bytes(chunk) for chunk in reader]
+    assert b"".join(chunks) == data and len(reader.buffers) == 2
+
+    reader = PipelinedReader(io.BytesIO(data), 3, 100)
+    for _ in reader:
+        break
+    assert not reader.thread.is_alive()
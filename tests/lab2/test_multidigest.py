@@ -0,0 +1,88 @@
+import hashlib
+import os
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from lab2.multidigest import CRC32, MultiDigest, hash_file, make_hasher
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    data = os.urandom(50000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    return str(path), data
+
+
+def test_crc32_matches_zlib():
+    crc = CRC32(b"123")
+    crc.update(b"456789")
+    assert crc.hexdigest() == "cbf43926" == format(zlib.crc32(b"123456789"), "08x")
+    copy = crc.copy()
+    copy.update(b"x")
+    assert crc.hexdigest() == "cbf43926"
+
+
+def test_make_hasher():
+    assert make_hasher("md5").__class__.__name__ == "MD5Hasher"
+    assert make_hasher("sha1").name == "sha1"
+    with pytest.raises(ValueError):
+        make_hasher("no-such-algorithm")
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+@pytest.mark.parametrize("size", [0, 1, 4096, 50000])
+def test_hash_file_all_algorithms(tmp_path, threaded, size):
+    data = os.urandom(size)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    result = hash_file(str(path), ("md5", "sha256", "sha1", "crc32"), threaded=threaded, chunk_size=4096)
+    assert result == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "crc32": format(zlib.crc32(data), "08x"),
+    }
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_file_is_read_once(data_file, threaded):
+    path, data = data_file
+    reads = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        original = f.readinto
+
+        def readinto(buffer):
+            read = original(buffer)
+            reads.append(read)
+            return read
+
+        f.readinto = readinto
+        return f
+
+    with patch("builtins.open", counting_open):
+        hash_file(path, ("md5", "sha256", "crc32"), threaded=threaded, chunk_size=4096)
+    assert sum(reads) == len(data)
+
+
+def test_progress_and_cancel(data_file):
+    path, data = data_file
+    progress = []
+    hash_file(path, chunk_size=10000, progress_callback=lambda value: progress.append(value) or True)
+    assert progress == [20, 40, 60, 80, 100, 100]
+    assert hash_file(path, threaded=True, chunk_size=10000, progress_callback=lambda value: value < 50) is None
+
+
+def test_multidigest_incremental_updates():
+    with MultiDigest(("md5", "crc32"), threaded=True) as digest:
+        for piece in (b"message ", b"digest"):
+            digest.update(piece)
+        assert digest.hexdigests() == {"md5": hashlib.md5(b"message digest").hexdigest(),
+                                       "crc32": format(zlib.crc32(b"message digest"), "08x")}
+    with pytest.raises(ValueError):
+        MultiDigest(())
@@ -4,8 +4,8 @@ from unittest.mock import Mock
 
 import pytest
 
-from lab2.md5 import MD5
-from lab2.utils2 import save_to_file, check_file_integrity, run_md5_tests
+from lab2.md5 import BACKENDS, MD5, compress_reference, register_backend
+from lab2.utils2 import save_to_file, check_file_integrity, fastest_backend, run_md5_tests, verify_backends
 
 
 @pytest.fixture
@@ -124,4 +124,26 @@ def test_check_file_integrity_case_insensitive(temp_dir):
     save_to_file(hash_file_path, hash_value)
 
     # Should pass even though original hash might be in different case
-    assert check_file_integrity(file_path, hash_file_path) is True
\ No newline at end of file
+    assert check_file_integrity(file_path, hash_file_path) is True
+
+def test_verify_backends_and_fastest():
+    results = verify_backends()
+    assert set(results) == set(BACKENDS)
+    assert all(results.values())
+    assert fastest_backend(sample_size=4096, repeats=1) in BACKENDS
+
+
+def test_verify_backends_checks_custom_backends():
+    register_backend("custom", compress_reference)
+    register_backend("broken", lambda state, block: compress_reference(state, block[::-1]))
+    try:
+        results = verify_backends()
+        assert results["custom"] and not results["broken"]
+        assert fastest_backend(sample_size=4096, repeats=1) != "broken"
+    finally:
+        del BACKENDS["custom"], BACKENDS["broken"]
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_run_md5_tests_per_backend(backend):
+    assert "Correct: False" not in run_md5_tests(backend)